@@ -0,0 +1 @@
+"""Benchmarks reproducibles de la API (se ejecutan con `python -m benchmarks.<modulo>`)."""
@@ -0,0 +1,376 @@
+"""Carga sintetica sobre todas las rutas de la API con el cliente WSGI de pruebas.
+
+Uso:
+    python -m benchmarks.api --scales 1000 100000 1000000 --requests 200 --output resultados.json
+    python -m benchmarks.api --scales 1000 --baseline resultados.json
+
+Cada escala es la cantidad de entradas en `watch_entries` (50 por usuario) y
+dimensiona tambien el catalogo. Por endpoint se informan p50/p95/p99, peticiones
+por segundo y sentencias SQL por peticion; con `--baseline` se agrega la
+variacion de p95 y de consultas frente a una corrida anterior.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import event, func, insert, select
+
+from benchmarks.watchlist_lookup import build_app
+from src.extensions import db, search
+from src.models import Genre, Movie, Season, Series, User, WatchEntry, series_genres
+
+BATCH_SIZE = 50_000
+ENTRIES_PER_USER = 50
+GENRES = ["drama", "comedia", "accion", "terror", "documental", "animacion", "crimen", "ciencia ficcion"]
+
+
+def catalog_size(entries: int) -> int:
+    """Peliculas (y series) del catalogo para una escala dada."""
+    return max(entries // 10, ENTRIES_PER_USER)
+
+
+def seed(entries: int) -> dict:
+    """Crea usuarios, catalogo, temporadas y `entries` filas de watchlist con Core."""
+    users = max(entries // ENTRIES_PER_USER, 1)
+    items = catalog_size(entries)
+    if db.session.scalar(select(func.count()).select_from(WatchEntry)):
+        return {"users": users, "catalog": items}
+
+    db.session.execute(insert(Genre), [{"id": i, "name": name} for i, name in enumerate(GENRES, start=1)])
+    for start in range(1, items + 1, BATCH_SIZE):
+        ids = range(start, min(start + BATCH_SIZE, items + 1))
+        db.session.execute(
+            insert(Movie),
+            [
+                {"id": i, "title": f"movie {i}", "genre": GENRES[i % len(GENRES)], "release_year": 1960 + i % 65}
+                for i in ids
+            ],
+        )
+        db.session.execute(
+            insert(Series),
+            [
+                {
+                    "id": i,
+                    "title": f"series {i}",
+                    "genres": GENRES[i % len(GENRES)],
+                    "synopsis": f"temporadas de la serie {i}",
+                    "total_seasons": 3,
+                    "total_episodes": 30,
+                }
+                for i in ids
+            ],
+        )
+        db.session.execute(
+            insert(series_genres), [{"series_id": i, "genre_id": i % len(GENRES) + 1} for i in ids]
+        )
+        db.session.execute(
+            insert(Season),
+            [{"series_id": i, "number": n, "episodes_count": 10} for i in ids for n in (1, 2, 3)],
+        )
+
+    db.session.execute(insert(User), [{"id": i, "name": f"user{i}"} for i in range(1, users + 1)])
+    rows = []
+    for n in range(entries):
+        user_id, k = n // ENTRIES_PER_USER + 1, n % ENTRIES_PER_USER
+        # Mitad series y mitad peliculas, sin repetir contenido dentro de un usuario.
+        content_id = (user_id * 37 + k // 2) % items + 1
+        if k % 2:
+            rows.append({"user_id": user_id, "movie_id": content_id, "series_id": None, "total_episodes": 1})
+        else:
+            rows.append(
+                {
+                    "user_id": user_id,
+                    "movie_id": None,
+                    "series_id": content_id,
+                    "watched_episodes": n % 30,
+                    "total_episodes": 30,
+                }
+            )
+        if len(rows) == BATCH_SIZE:
+            db.session.execute(insert(WatchEntry), rows)
+            rows = []
+    if rows:
+        db.session.execute(insert(WatchEntry), rows)
+    # Las cargas con Core no disparan los eventos ORM del indice de busqueda.
+    search.rebuild()
+    db.session.commit()
+    return {"users": users, "catalog": items}
+
+
+def scenarios(users: int, items: int) -> list[tuple[str, str, object]]:
+    """(nombre, regla de la ruta, fabrica de peticion) para cada endpoint a medir.
+
+    La fabrica recibe un `random.Random` y devuelve (metodo, url, kwargs del cliente).
+    """
+
+    def user(rng):
+        return {"X-User-Id": str(rng.randint(1, users))}
+
+    def item(rng):
+        return rng.randint(1, items)
+
+    def ids(rng):
+        return [item(rng) for _ in range(50)]
+
+    def created(kind):
+        # Crea (sin medir) el recurso que luego se modifica o elimina.
+        def factory(rng, client):
+            payload = {"title": f"bench {rng.random()}"}
+            return client.post(f"/{kind}/", json=payload).get_json()["id"]
+
+        return factory
+
+    return [
+        ("health_live", "/health/", lambda rng: ("GET", "/health/", {})),
+        ("health_ready", "/health/ready", lambda rng: ("GET", "/health/ready", {})),
+        ("health_cache", "/health/cache", lambda rng: ("GET", "/health/cache", {})),
+        ("health_pool", "/health/pool", lambda rng: ("GET", "/health/pool", {})),
+        ("movies_list", "/movies/", lambda rng: ("GET", "/movies/?limit=50", {})),
+        (
+            "movies_filtered",
+            "/movies/",
+            lambda rng: ("GET", f"/movies/?genre={rng.choice(GENRES)}&sort=-release_year&limit=50", {}),
+        ),
+        ("movies_detail", "/movies/<int:movie_id>", lambda rng: ("GET", f"/movies/{item(rng)}", {})),
+        (
+            "movies_batch",
+            "/movies/batch",
+            lambda rng: ("POST", "/movies/batch", {"json": {"ids": ids(rng), "fields": ["title"]}}),
+        ),
+        ("movies_create", "/movies/", lambda rng: ("POST", "/movies/", {"json": {"title": "bench", "genre": "drama"}})),
+        (
+            "movies_update",
+            "/movies/<int:movie_id>",
+            lambda rng: ("PUT", f"/movies/{item(rng)}", {"json": {"release_year": 1960 + rng.randint(0, 64)}}),
+        ),
+        ("movies_delete", "/movies/<int:movie_id>", ("DELETE", created("movies"))),
+        ("series_list", "/series/", lambda rng: ("GET", "/series/?limit=50", {})),
+        (
+            "series_filtered",
+            "/series/",
+            lambda rng: ("GET", f"/series/?genre={rng.choice(GENRES)}&sort=title&limit=50", {}),
+        ),
+        ("series_detail", "/series/<int:series_id>", lambda rng: ("GET", f"/series/{item(rng)}", {})),
+        (
+            "series_batch",
+            "/series/batch",
+            lambda rng: ("POST", "/series/batch", {"json": {"ids": ids(rng), "fields": ["title", "image_url"]}}),
+        ),
+        ("series_create", "/series/", lambda rng: ("POST", "/series/", {"json": {"title": "bench", "genres": "drama"}})),
+        (
+            "series_update",
+            "/series/<int:series_id>",
+            lambda rng: ("PUT", f"/series/{item(rng)}", {"json": {"synopsis": f"editada {rng.random()}"}}),
+        ),
+        ("series_delete", "/series/<int:series_id>", ("DELETE", created("series"))),
+        (
+            "series_season",
+            "/series/<int:series_id>/seasons",
+            lambda rng: ("POST", f"/series/{item(rng)}/seasons", {"json": {"number": 3, "episodes_count": 10}}),
+        ),
+        ("search", "/search/", lambda rng: ("GET", f"/search/?q=series {item(rng)}", {})),
+        ("watchlist", "/me/watchlist", lambda rng: ("GET", "/me/watchlist", {"headers": user(rng)})),
+        (
+            "continue_watching",
+            "/me/continue-watching",
+            lambda rng: ("GET", "/me/continue-watching", {"headers": user(rng)}),
+        ),
+        (
+            "watchlist_expanded",
+            "/me/watchlist",
+            lambda rng: ("GET", "/me/watchlist?expand=title", {"headers": user(rng)}),
+        ),
+        (
+            "watchlist_ndjson",
+            "/me/watchlist",
+            lambda rng: ("GET", "/me/watchlist?format=ndjson", {"headers": user(rng)}),
+        ),
+        ("stats", "/me/stats", lambda rng: ("GET", "/me/stats", {"headers": user(rng)})),
+        (
+            "watchlist_add_movie",
+            "/watchlist/movies/<int:movie_id>",
+            lambda rng: ("POST", f"/watchlist/movies/{item(rng)}", {"headers": user(rng)}),
+        ),
+        (
+            "watchlist_add_series",
+            "/watchlist/series/<int:series_id>",
+            lambda rng: ("POST", f"/watchlist/series/{item(rng)}", {"headers": user(rng)}),
+        ),
+        (
+            "watchlist_bulk",
+            "/watchlist/bulk",
+            lambda rng: (
+                "POST",
+                "/watchlist/bulk",
+                {
+                    "headers": user(rng),
+                    "json": {"movies": [item(rng) for _ in range(10)], "series": [item(rng) for _ in range(10)]},
+                },
+            ),
+        ),
+        (
+            "progress_patch",
+            "/progress/series/<int:series_id>",
+            lambda rng: _progress_request(rng, users, items, "PATCH", {"watched_episodes": rng.randint(0, 30)}),
+        ),
+        (
+            "progress_next",
+            "/progress/series/<int:series_id>/next",
+            lambda rng: _progress_request(rng, users, items, "POST", None),
+        ),
+    ]
+
+
+def _progress_request(rng, users: int, items: int, method: str, payload: dict | None):
+    """Apunta a una serie que el usuario tiene en la watchlist segun el patron del seed."""
+    user_id = rng.randint(1, users)
+    k = rng.randrange(0, ENTRIES_PER_USER, 2)
+    series_id = (user_id * 37 + k // 2) % items + 1
+    path = f"/progress/series/{series_id}" + ("/next" if payload is None else "")
+    kwargs = {"headers": {"X-User-Id": str(user_id)}}
+    if payload is not None:
+        kwargs["json"] = payload
+    return method, path, kwargs
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Percentil por rango mas cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    index = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def run_scenario(client, counter: list, name: str, rule: str, factory, requests: int, seed_value: int) -> dict:
+    """Ejecuta `requests` peticiones de un escenario midiendo latencia y consultas."""
+    rng = random.Random(seed_value)
+    latencies, queries, errors = [], [], 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        if isinstance(factory, tuple):
+            method, prepare = factory
+            path = f"{rule.split('<')[0]}{prepare(rng, client)}"
+            kwargs = {}
+        else:
+            method, path, kwargs = factory(rng)
+        counter[0] = 0
+        request_start = time.perf_counter()
+        response = client.open(path, method=method, **kwargs)
+        response.get_data()  # consume tambien las respuestas en streaming
+        latencies.append((time.perf_counter() - request_start) * 1000)
+        queries.append(counter[0])
+        if response.status_code >= 400:
+            errors += 1
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "endpoint": name,
+        "method": method,
+        "route": rule,
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "throughput_rps": round(requests / sum(latencies) * 1000, 1),
+        "wall_seconds": round(wall, 3),
+        "queries_per_request": round(sum(queries) / len(queries), 2),
+        "max_queries": max(queries),
+    }
+
+
+def compare(results: list[dict], baseline_path: Path) -> list[dict]:
+    """Variacion de p95 y consultas por peticion frente a una corrida anterior."""
+    baseline = json.loads(baseline_path.read_text())
+    previous = {(row["scale"], row["endpoint"]): row for row in baseline.get("results", [])}
+    deltas = []
+    for row in results:
+        before = previous.get((row["scale"], row["endpoint"]))
+        if before is None:
+            continue
+        deltas.append(
+            {
+                "scale": row["scale"],
+                "endpoint": row["endpoint"],
+                "p95_ratio": round(row["p95_ms"] / before["p95_ms"], 3) if before["p95_ms"] else None,
+                "queries_delta": round(row["queries_per_request"] - before["queries_per_request"], 2),
+            }
+        )
+    return deltas
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--requests", type=int, default=200, help="Peticiones medidas por endpoint")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--only", nargs="+", help="Limita la corrida a estos escenarios")
+    parser.add_argument("--db-dir", type=Path, help="Directorio para reutilizar las bases sembradas")
+    parser.add_argument("--output", type=Path, help="Archivo JSON de salida (por defecto stdout)")
+    parser.add_argument("--baseline", type=Path, help="JSON de una corrida anterior para comparar")
+    args = parser.parse_args()
+
+    db_dir = args.db_dir or Path(tempfile.mkdtemp())
+    db_dir.mkdir(parents=True, exist_ok=True)
+    results, uncovered = [], set()
+    for scale in sorted(args.scales):
+        app = build_app(db_dir / f"api_{scale}.db")
+        counter = [0]
+        with app.app_context():
+            event.listen(db.engine, "before_cursor_execute", lambda *_: counter.__setitem__(0, counter[0] + 1))
+            sizes = seed(scale)
+        client = app.test_client()
+        cases = scenarios(sizes["users"], sizes["catalog"])
+        uncovered |= {
+            rule.rule
+            for rule in app.url_map.iter_rules()
+            if rule.endpoint != "static" and rule.rule not in {case[1] for case in cases}
+        }
+        for index, (name, rule, factory) in enumerate(cases):
+            if args.only and name not in args.only:
+                continue
+            run_scenario(client, counter, name, rule, factory, args.warmup, index)
+            row = run_scenario(client, counter, name, rule, factory, args.requests, 1000 + index)
+            results.append({"scale": scale, **row})
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "requests_per_endpoint": args.requests,
+            "uncovered_routes": sorted(uncovered),
+        },
+        "results": results,
+    }
+    if args.baseline:
+        report["compare"] = compare(results, args.baseline)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compara filas/segundo entre la lectura ORM (`to_dict`) y la lectura con Core.
+
+Uso:
+    python -m benchmarks.read_path --rows 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import insert, select
+
+from benchmarks.watchlist_lookup import build_app
+from src.extensions import db
+from src.models import Movie, User, WatchEntry
+
+
+def seed(rows: int) -> None:
+    """Crea `rows` peliculas y una watchlist de `rows` entradas para un usuario."""
+    db.session.execute(insert(User), [{"id": 1, "name": "bench"}])
+    db.session.execute(
+        insert(Movie),
+        [{"id": i, "title": f"movie{i}", "genre": "drama", "release_year": 2000 + i % 25} for i in range(1, rows + 1)],
+    )
+    db.session.execute(
+        insert(WatchEntry),
+        [
+            {"user_id": 1, "movie_id": i, "watched_episodes": i % 7, "total_episodes": 6}
+            for i in range(1, rows + 1)
+        ],
+    )
+    db.session.commit()
+
+
+def timed(label: str, fn, rows: int, repeat: int) -> dict:
+    """Ejecuta `fn` varias veces y devuelve la mejor marca en filas/segundo."""
+    best = float("inf")
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        produced = len(fn())
+        best = min(best, time.perf_counter() - started)
+        assert produced == rows, (label, produced)
+    return {"path": label, "seconds": round(best, 4), "rows_per_sec": int(rows / best)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    app = build_app(Path(tempfile.mkdtemp()) / "bench.db")
+    with app.app_context():
+        seed(args.rows)
+        entries = select(*WatchEntry.public_columns()).where(WatchEntry.__table__.c.user_id == 1)
+        cases = [
+            ("movies_orm", lambda: [m.to_dict() for m in Movie.query.all()]),
+            ("movies_core", lambda: [dict(r) for r in db.session.execute(select(*Movie.public_columns())).mappings()]),
+            ("watchlist_orm", lambda: [e.to_dict() for e in WatchEntry.query.filter_by(user_id=1).all()]),
+            ("watchlist_core", lambda: [dict(r) for r in db.session.execute(entries).mappings()]),
+        ]
+        results = [timed(label, fn, args.rows, args.repeat) for label, fn in cases]
+    print(json.dumps({"rows": args.rows, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Peticiones por segundo con 200 clientes concurrentes contra gunicorn en cada modo.
+
+Uso:
+    python -m benchmarks.serving --modes sync gevent --clients 200 --duration 15
+    python -m benchmarks.serving --database-url postgresql://... --workers 2
+
+Levanta `gunicorn -c gunicorn.conf.py wsgi:app` con `GUNICORN_WORKER_CLASS` en
+cada modo sobre la misma base sembrada y mide solo lecturas (watchlist,
+detalle, listados, stats). Con SQLite cada consulta bloquea el worker aunque
+se use gevent; la diferencia entre modos aparece con Postgres (red + psycogreen).
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import importlib.util
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.api import percentile, seed
+from src import create_app
+from src.config import TestingConfig
+from src.extensions import db
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def prepare_database(url: str, entries: int) -> dict:
+    """Crea el esquema y siembra la base que usaran todos los modos."""
+
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = url
+        SQLALCHEMY_ENGINE_OPTIONS: dict = {}
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        return seed(entries)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode: str, url: str, workers: int, connections: int) -> tuple[subprocess.Popen, int]:
+    """Arranca gunicorn en el modo pedido y espera a que responda /health/."""
+    port = free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": url,
+        "PORT": str(port),
+        "GUNICORN_WORKER_CLASS": mode,
+        "WEB_CONCURRENCY": str(workers),
+        "GUNICORN_WORKER_CONNECTIONS": str(connections),
+        "HEALTH_REQUIRE_MIGRATIONS": "0",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health/")
+            if conn.getresponse().status == 200:
+                return process, port
+        except OSError:
+            time.sleep(0.2)
+        if process.poll() is not None:
+            break
+    process.terminate()
+    raise RuntimeError(f"gunicorn no arranco en modo {mode}")
+
+
+def drive(port: int, clients: int, duration: float, users: int, items: int) -> dict:
+    """Cada cliente reutiliza su conexion (keep-alive) y pide rutas al azar hasta `duration`."""
+    latencies: list[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+    barrier = threading.Barrier(clients)
+
+    def client(index: int) -> None:
+        rng = random.Random(index)
+        local, failed = [], 0
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        barrier.wait()
+        while time.monotonic() < stop_at:
+            user = str(rng.randint(1, users))
+            path, headers = rng.choice(
+                [
+                    ("/me/watchlist", {"X-User-Id": user}),
+                    ("/me/stats", {"X-User-Id": user}),
+                    (f"/movies/{rng.randint(1, items)}", {}),
+                    (f"/series/{rng.randint(1, items)}", {}),
+                    ("/series/?limit=20", {}),
+                ]
+            )
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 400:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            local.append((time.perf_counter() - start) * 1000)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", nargs="+", default=["sync", "gevent"])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--entries", type=int, default=10_000, help="Entradas de watchlist a sembrar")
+    parser.add_argument("--database-url", help="Base a usar (por defecto un SQLite temporal)")
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{Path(tempfile.mkdtemp()) / 'serving.db'}"
+    sizes = prepare_database(url, args.entries)
+    users, items = sizes["users"], sizes["catalog"]
+
+    results = []
+    for mode in args.modes:
+        if mode == "gevent" and importlib.util.find_spec("gevent") is None:
+            results.append({"mode": mode, "error": "gevent no esta instalado (pip install -r requirements-gevent.txt)"})
+            continue
+        process, port = start_server(mode, url, args.workers, args.clients)
+        try:
+            results.append({"mode": mode, **drive(port, args.clients, args.duration, users, items)})
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    print(
+        json.dumps(
+            {
+                "clients": args.clients,
+                "workers": args.workers,
+                "duration_seconds": args.duration,
+                "database": url.split(":", 1)[0],
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Mide la busqueda de la watchlist de un usuario a medida que crece `watch_entries`.
+
+Uso:
+    python -m benchmarks.watchlist_lookup --sizes 10000 100000 1000000 10000000
+
+Se miden las consultas que ejecuta la API (`ProgressService._watchlist_query`,
+con todas las columnas publicas y con `expand=title`). Con los indices por
+`user_id` el tiempo por consulta debe crecer de forma logaritmica (practicamente
+plano) y el plan debe usar `ix_watch_entries_*`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import bindparam, func, insert, select, text
+
+from src import create_app
+from src.api.progress import ProgressService
+from src.config import TestingConfig
+from src.extensions import db
+from src.models import Movie, Series, User, WatchEntry
+
+BATCH_SIZE = 50_000
+
+
+def build_app(db_path: Path):
+    """Crea la app apuntando a una base SQLite en disco."""
+
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def seed(target_rows: int, users: int, series: int) -> None:
+    """Completa `watch_entries` hasta `target_rows` filas con datos sinteticos."""
+    if not db.session.scalar(select(func.count()).select_from(User)):
+        db.session.execute(insert(User), [{"id": i, "name": f"user{i}"} for i in range(1, users + 1)])
+        db.session.execute(insert(Series), [{"id": i, "title": f"series{i}"} for i in range(1, series + 1)])
+        db.session.execute(insert(Movie), [{"id": i, "title": f"movie{i}"} for i in range(1, series + 1)])
+
+    current = db.session.scalar(select(func.count()).select_from(WatchEntry))
+    while current < target_rows:
+        batch = []
+        for offset in range(min(BATCH_SIZE, target_rows - current)):
+            n = current + offset
+            # Cada (usuario, serie) es unico: se recorren las series por usuario.
+            batch.append({"user_id": n % users + 1, "series_id": n // users + 1, "watched_episodes": n % 10})
+        db.session.execute(insert(WatchEntry), batch)
+        current += len(batch)
+    db.session.commit()
+
+
+def query_plan(conn, stmt, **params) -> list[str]:
+    """EXPLAIN QUERY PLAN de la sentencia con los parametros dados."""
+    compiled = stmt.params(**params).compile(conn, compile_kwargs={"literal_binds": True})
+    return [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+
+
+def measure(users: int, lookups: int) -> dict:
+    """Ejecuta `lookups` consultas de watchlist (las de GET /me/watchlist) y de progreso por serie."""
+    conn = db.session.connection()
+    service = ProgressService()
+    watchlist = service._watchlist_query(bindparam("u"), frozenset())
+    expanded = service._watchlist_query(bindparam("u"), frozenset({"title"}))
+    progress = select(*WatchEntry.public_columns()).where(
+        WatchEntry.user_id == bindparam("u"), WatchEntry.series_id == bindparam("s")
+    )
+
+    rng = random.Random(42)
+    timings = {}
+    for name, stmt in (("watchlist_ms", watchlist), ("watchlist_expanded_ms", expanded)):
+        started = time.perf_counter()
+        for _ in range(lookups):
+            conn.execute(stmt, {"u": rng.randint(1, users)}).fetchall()
+        timings[name] = round((time.perf_counter() - started) * 1000 / lookups, 4)
+
+    started = time.perf_counter()
+    for _ in range(lookups):
+        conn.execute(progress, {"u": rng.randint(1, users), "s": rng.randint(1, 50)}).first()
+    progress_ms = (time.perf_counter() - started) * 1000 / lookups
+
+    return {
+        **timings,
+        "series_progress_ms": round(progress_ms, 4),
+        "plan": query_plan(conn, watchlist, u=1),
+        "plan_expanded": query_plan(conn, expanded, u=1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    parser.add_argument("--db", type=Path, help="Archivo SQLite a reutilizar entre corridas")
+    args = parser.parse_args()
+
+    db_path = args.db or Path(tempfile.mkdtemp()) / "bench.db"
+    series = max(args.sizes) // args.users + 1
+    app = build_app(db_path)
+    results = []
+    with app.app_context():
+        for size in sorted(args.sizes):
+            seed(size, args.users, series)
+            results.append({"rows": size, **measure(args.users, args.lookups)})
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
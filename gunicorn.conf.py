@@ -0,0 +1,38 @@
+"""Configuracion de gunicorn (se carga sola desde la raiz del proyecto).
+
+Modos de servicio (`GUNICORN_WORKER_CLASS`):
+- sync (por defecto): un request a la vez por worker.
+- gevent: cada worker atiende hasta `GUNICORN_WORKER_CONNECTIONS` requests
+  concurrentes y cede el control mientras espera a Postgres. Requiere
+  `pip install -r requirements-gevent.txt` (gevent y psycogreen).
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "200"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+accesslog = os.getenv("GUNICORN_ACCESSLOG") or None
+
+if worker_class == "gevent":
+    # La app se importa en cada worker despues del monkey patching de gevent; con
+    # preload los candados y el pool se crearian antes y bloquearian el worker entero.
+    preload_app = False
+    # Muchas greenlets comparten el pool del worker: se agranda salvo que se configure.
+    os.environ.setdefault("DB_POOL_SIZE", str(min(worker_connections // 4, 20)))
+    os.environ.setdefault("DB_MAX_OVERFLOW", "10")
+
+
+def post_fork(server, worker):
+    """Con gevent, hace que psycopg2 ceda el control durante las consultas."""
+    if worker_class != "gevent":
+        return
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        server.log.warning("psycogreen no instalado: las consultas a Postgres bloquean el worker")
+        return
+    patch_psycopg()
@@ -45,6 +45,17 @@ target_db = current_app.extensions['migrate'].db
 # ... etc.
 
 
+# El indice de busqueda (FTS5 en SQLite, search_vector en Postgres) se
+# gestiona con SQL propio y no forma parte de los modelos.
+SEARCH_OBJECTS = ('search_index', 'search_vector', 'ix_movies_search', 'ix_series_search')
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if reflected and compare_to is None and (name or '').startswith(SEARCH_OBJECTS):
+        return False
+    return True
+
+
 def get_metadata():
     if hasattr(target_db, 'metadatas'):
         return target_db.metadatas[None]
@@ -93,6 +104,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
@@ -0,0 +1,45 @@
+"""add watch_entries indexes
+
+Revision ID: 3f1a9c2b7d41
+Revises: e62bc36ef332
+Create Date: 2026-10-18 09:12:04.518233
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1a9c2b7d41'
+down_revision = 'e62bc36ef332'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Elimina duplicados previos (conserva la entrada mas antigua) para poder
+    # crear los indices unicos parciales.
+    for column in ('movie_id', 'series_id'):
+        op.execute(
+            f"DELETE FROM watch_entries WHERE {column} IS NOT NULL AND id NOT IN ("
+            f"SELECT MIN(id) FROM watch_entries WHERE {column} IS NOT NULL "
+            f"GROUP BY user_id, {column})"
+        )
+
+    op.create_index('ix_watch_entries_user_updated', 'watch_entries', ['user_id', 'updated_at'], unique=False)
+    op.create_index(
+        'uq_watch_entries_user_series', 'watch_entries', ['user_id', 'series_id'], unique=True,
+        sqlite_where=sa.text('series_id IS NOT NULL'),
+        postgresql_where=sa.text('series_id IS NOT NULL'),
+    )
+    op.create_index(
+        'uq_watch_entries_user_movie', 'watch_entries', ['user_id', 'movie_id'], unique=True,
+        sqlite_where=sa.text('movie_id IS NOT NULL'),
+        postgresql_where=sa.text('movie_id IS NOT NULL'),
+    )
+
+
+def downgrade():
+    op.drop_index('uq_watch_entries_user_movie', table_name='watch_entries')
+    op.drop_index('uq_watch_entries_user_series', table_name='watch_entries')
+    op.drop_index('ix_watch_entries_user_updated', table_name='watch_entries')
@@ -0,0 +1,37 @@
+"""add series total_episodes
+
+Revision ID: 8b2d4e6f1a93
+Revises: 3f1a9c2b7d41
+Create Date: 2026-10-18 10:03:47.201561
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2d4e6f1a93'
+down_revision = '3f1a9c2b7d41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('series', sa.Column('total_episodes', sa.Integer(), server_default='0', nullable=False))
+
+    # Rellena el total con las temporadas existentes y propaga el valor a las
+    # entradas que se crearon con total_episodes=0.
+    op.execute(
+        "UPDATE series SET total_episodes = COALESCE("
+        "(SELECT SUM(seasons.episodes_count) FROM seasons WHERE seasons.series_id = series.id), 0)"
+    )
+    op.execute(
+        "UPDATE watch_entries SET total_episodes = "
+        "(SELECT series.total_episodes FROM series WHERE series.id = watch_entries.series_id) "
+        "WHERE series_id IS NOT NULL AND COALESCE(total_episodes, 0) = 0"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('series') as batch_op:
+        batch_op.drop_column('total_episodes')
@@ -0,0 +1,24 @@
+"""add continue watching index
+
+Revision ID: a4d7e2b9c3f1
+Revises: f2c6a8d4b1e7
+Create Date: 2026-10-18 17:04:45.079779
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4d7e2b9c3f1'
+down_revision = 'f2c6a8d4b1e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_watch_entries_user_status_updated', 'watch_entries', ['user_id', 'status', sa.text('updated_at DESC')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_watch_entries_user_status_updated', table_name='watch_entries')
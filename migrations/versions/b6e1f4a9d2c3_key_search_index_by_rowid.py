@@ -0,0 +1,33 @@
+"""key search index by rowid
+
+Revision ID: b6e1f4a9d2c3
+Revises: a4d7e2b9c3f1
+Create Date: 2026-10-18 18:20:11.402317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e1f4a9d2c3'
+down_revision = 'a4d7e2b9c3f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Las escrituras borran por rowid (id*2 peliculas, id*2+1 series) en vez de
+    # recorrer las columnas UNINDEXED kind/ref_id; se recargan las filas con ese rowid.
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DELETE FROM search_index")
+        op.execute(
+            "INSERT INTO search_index (rowid, kind, ref_id, title, genres, synopsis) "
+            "SELECT id * 2, 'movie', id, title, genre, NULL FROM movies "
+            "UNION ALL SELECT id * 2 + 1, 'series', id, title, genres, synopsis FROM series"
+        )
+
+
+def downgrade():
+    # Las filas siguen siendo validas con el esquema anterior (kind/ref_id se conservan).
+    pass
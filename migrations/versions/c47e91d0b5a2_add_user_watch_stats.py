@@ -0,0 +1,38 @@
+"""add user_watch_stats
+
+Revision ID: c47e91d0b5a2
+Revises: 8b2d4e6f1a93
+Create Date: 2026-10-18 11:26:15.904472
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47e91d0b5a2'
+down_revision = '8b2d4e6f1a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_watch_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('entries', sa.Integer(), nullable=False),
+    sa.Column('watched_episodes', sa.Integer(), nullable=False),
+    sa.Column('total_episodes', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'status')
+    )
+    op.execute(
+        "INSERT INTO user_watch_stats (user_id, status, entries, watched_episodes, total_episodes) "
+        "SELECT user_id, COALESCE(status, 'in_progress'), COUNT(*), "
+        "SUM(COALESCE(watched_episodes, 0)), SUM(COALESCE(total_episodes, 0)) "
+        "FROM watch_entries GROUP BY user_id, COALESCE(status, 'in_progress')"
+    )
+
+
+def downgrade():
+    op.drop_table('user_watch_stats')
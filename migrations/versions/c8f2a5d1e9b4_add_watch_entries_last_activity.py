@@ -0,0 +1,34 @@
+"""add watch entries last activity
+
+Revision ID: c8f2a5d1e9b4
+Revises: b6e1f4a9d2c3
+Create Date: 2026-10-18 18:41:27.905114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8f2a5d1e9b4'
+down_revision = 'b6e1f4a9d2c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('watch_entries', sa.Column('last_activity_at', sa.DateTime(), nullable=True))
+    # La mejor aproximacion disponible para las entradas existentes.
+    op.execute("UPDATE watch_entries SET last_activity_at = updated_at")
+    op.drop_index('ix_watch_entries_user_status_updated', table_name='watch_entries')
+    op.create_index('ix_watch_entries_user_status_activity', 'watch_entries', ['user_id', 'status', sa.text('last_activity_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_watch_entries_user_status_activity', table_name='watch_entries')
+    op.create_index('ix_watch_entries_user_status_updated', 'watch_entries', ['user_id', 'status', sa.text('updated_at DESC')], unique=False)
+    if op.get_bind().dialect.name == 'sqlite':
+        # DROP COLUMN nativo (SQLite >= 3.35): batch recrearia la tabla y perderia los triggers.
+        op.execute("ALTER TABLE watch_entries DROP COLUMN last_activity_at")
+    else:
+        op.drop_column('watch_entries', 'last_activity_at')
@@ -0,0 +1,28 @@
+"""add movie genre sort indexes
+
+Revision ID: d3b7e9a1c5f2
+Revises: c8f2a5d1e9b4
+Create Date: 2026-10-18 20:12:36.418207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3b7e9a1c5f2'
+down_revision = 'c8f2a5d1e9b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_movies_genre_release_year_id', 'movies', [sa.text('lower(genre)'), 'release_year', 'id'], unique=False)
+    op.create_index('ix_movies_genre_title_id', 'movies', [sa.text('lower(genre)'), 'title', 'id'], unique=False)
+    op.create_index('ix_movies_genre_updated_at_id', 'movies', [sa.text('lower(genre)'), 'updated_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_movies_genre_updated_at_id', table_name='movies')
+    op.drop_index('ix_movies_genre_title_id', table_name='movies')
+    op.drop_index('ix_movies_genre_release_year_id', table_name='movies')
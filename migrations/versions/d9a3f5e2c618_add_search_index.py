@@ -0,0 +1,56 @@
+"""add search index
+
+Revision ID: d9a3f5e2c618
+Revises: c47e91d0b5a2
+Create Date: 2026-10-18 12:40:52.337108
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9a3f5e2c618'
+down_revision = 'c47e91d0b5a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+            "kind UNINDEXED, ref_id UNINDEXED, title, genres, synopsis, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "INSERT INTO search_index (kind, ref_id, title, genres, synopsis) "
+            "SELECT 'movie', id, title, genre, NULL FROM movies "
+            "UNION ALL SELECT 'series', id, title, genres, synopsis FROM series"
+        )
+    elif dialect == 'postgresql':
+        op.execute(
+            "ALTER TABLE movies ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(genre, '')), 'B')) STORED"
+        )
+        op.execute(
+            "ALTER TABLE series ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(genres, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(synopsis, '')), 'C')) STORED"
+        )
+        op.create_index('ix_movies_search', 'movies', ['search_vector'], postgresql_using='gin')
+        op.create_index('ix_series_search', 'series', ['search_vector'], postgresql_using='gin')
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS search_index")
+    elif dialect == 'postgresql':
+        op.drop_index('ix_series_search', table_name='series')
+        op.drop_index('ix_movies_search', table_name='movies')
+        op.drop_column('series', 'search_vector')
+        op.drop_column('movies', 'search_vector')
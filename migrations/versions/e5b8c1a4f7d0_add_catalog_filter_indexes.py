@@ -0,0 +1,71 @@
+"""add catalog filter indexes and genres
+
+Revision ID: e5b8c1a4f7d0
+Revises: d9a3f5e2c618
+Create Date: 2026-10-18 13:52:09.611840
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b8c1a4f7d0'
+down_revision = 'd9a3f5e2c618'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('genres',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('series_genres',
+    sa.Column('series_id', sa.Integer(), nullable=False),
+    sa.Column('genre_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['genre_id'], ['genres.id'], ),
+    sa.ForeignKeyConstraint(['series_id'], ['series.id'], ),
+    sa.PrimaryKeyConstraint('series_id', 'genre_id')
+    )
+    op.create_index('ix_series_genres_genre', 'series_genres', ['genre_id', 'series_id'], unique=False)
+    op.create_index('ix_movies_genre_lower', 'movies', [sa.text('lower(genre)')], unique=False)
+    op.create_index('ix_movies_release_year_id', 'movies', ['release_year', 'id'], unique=False)
+    op.create_index('ix_movies_title_id', 'movies', ['title', 'id'], unique=False)
+    op.create_index('ix_movies_updated_at_id', 'movies', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_series_title_id', 'series', ['title', 'id'], unique=False)
+    op.create_index('ix_series_updated_at_id', 'series', ['updated_at', 'id'], unique=False)
+
+    # Normaliza el texto libre existente de series.genres en la tabla puente.
+    bind = op.get_bind()
+    genre_ids = {}
+    links = []
+    for series_id, value in bind.execute(sa.text("SELECT id, genres FROM series WHERE genres IS NOT NULL")):
+        names = dict.fromkeys(part.strip().lower() for part in value.split(','))
+        for name in names:
+            if not name:
+                continue
+            if name not in genre_ids:
+                genre_ids[name] = len(genre_ids) + 1
+            links.append({'series_id': series_id, 'genre_id': genre_ids[name]})
+    if genre_ids:
+        genres = sa.table('genres', sa.column('id', sa.Integer), sa.column('name', sa.String))
+        series_genres = sa.table('series_genres', sa.column('series_id', sa.Integer), sa.column('genre_id', sa.Integer))
+        op.bulk_insert(genres, [{'id': genre_id, 'name': name} for name, genre_id in genre_ids.items()])
+        op.bulk_insert(series_genres, links)
+        if bind.dialect.name == 'postgresql':
+            op.execute("SELECT setval('genres_id_seq', (SELECT MAX(id) FROM genres))")
+
+
+def downgrade():
+    op.drop_index('ix_series_updated_at_id', table_name='series')
+    op.drop_index('ix_series_title_id', table_name='series')
+    op.drop_index('ix_movies_updated_at_id', table_name='movies')
+    op.drop_index('ix_movies_title_id', table_name='movies')
+    op.drop_index('ix_movies_release_year_id', table_name='movies')
+    op.drop_index('ix_movies_genre_lower', table_name='movies')
+    op.drop_index('ix_series_genres_genre', table_name='series_genres')
+    op.drop_table('series_genres')
+    op.drop_table('genres')
@@ -0,0 +1,83 @@
+"""add watch stats triggers
+
+Revision ID: f2c6a8d4b1e7
+Revises: e5b8c1a4f7d0
+Create Date: 2026-10-18 15:02:37.418220
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c6a8d4b1e7'
+down_revision = 'e5b8c1a4f7d0'
+branch_labels = None
+depends_on = None
+
+
+ADD_NEW = (
+    "INSERT INTO user_watch_stats (user_id, status, entries, watched_episodes, total_episodes) "
+    "VALUES (NEW.user_id, COALESCE(NEW.status, 'in_progress'), 1, "
+    "COALESCE(NEW.watched_episodes, 0), COALESCE(NEW.total_episodes, 0)) "
+    "ON CONFLICT (user_id, status) DO UPDATE SET "
+    "entries = user_watch_stats.entries + 1, "
+    "watched_episodes = user_watch_stats.watched_episodes + excluded.watched_episodes, "
+    "total_episodes = user_watch_stats.total_episodes + excluded.total_episodes;"
+)
+REMOVE_OLD = (
+    "UPDATE user_watch_stats SET entries = entries - 1, "
+    "watched_episodes = watched_episodes - COALESCE(OLD.watched_episodes, 0), "
+    "total_episodes = total_episodes - COALESCE(OLD.total_episodes, 0) "
+    "WHERE user_id = OLD.user_id AND status = COALESCE(OLD.status, 'in_progress');"
+)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS trg_watch_entries_stats_insert AFTER INSERT ON watch_entries "
+            f"BEGIN {ADD_NEW} END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS trg_watch_entries_stats_delete AFTER DELETE ON watch_entries "
+            f"BEGIN {REMOVE_OLD} END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS trg_watch_entries_stats_update "
+            "AFTER UPDATE OF user_id, status, watched_episodes, total_episodes ON watch_entries "
+            f"BEGIN {REMOVE_OLD} {ADD_NEW} END"
+        )
+    elif dialect == 'postgresql':
+        op.execute(
+            "CREATE OR REPLACE FUNCTION watch_entries_stats() RETURNS trigger AS $$ BEGIN "
+            f"IF TG_OP IN ('UPDATE', 'DELETE') THEN {REMOVE_OLD} END IF; "
+            f"IF TG_OP IN ('UPDATE', 'INSERT') THEN {ADD_NEW} END IF; "
+            "RETURN NULL; END; $$ LANGUAGE plpgsql"
+        )
+        op.execute(
+            "CREATE TRIGGER trg_watch_entries_stats "
+            "AFTER INSERT OR DELETE OR UPDATE OF user_id, status, watched_episodes, total_episodes "
+            "ON watch_entries FOR EACH ROW EXECUTE FUNCTION watch_entries_stats()"
+        )
+
+    # Punto de partida consistente con watch_entries para los triggers.
+    op.execute("DELETE FROM user_watch_stats")
+    op.execute(
+        "INSERT INTO user_watch_stats (user_id, status, entries, watched_episodes, total_episodes) "
+        "SELECT user_id, COALESCE(status, 'in_progress'), COUNT(*), "
+        "SUM(COALESCE(watched_episodes, 0)), SUM(COALESCE(total_episodes, 0)) "
+        "FROM watch_entries GROUP BY user_id, COALESCE(status, 'in_progress')"
+    )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS trg_watch_entries_stats_update")
+        op.execute("DROP TRIGGER IF EXISTS trg_watch_entries_stats_delete")
+        op.execute("DROP TRIGGER IF EXISTS trg_watch_entries_stats_insert")
+    elif dialect == 'postgresql':
+        op.execute("DROP TRIGGER IF EXISTS trg_watch_entries_stats ON watch_entries")
+        op.execute("DROP FUNCTION IF EXISTS watch_entries_stats()")
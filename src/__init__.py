@@ -3,16 +3,19 @@
 from flask import Flask
 from flask_cors import CORS
 from .config import DevelopmentConfig
-from .extensions import db, migrate
+from .extensions import cache, continue_watching_store, db, idempotency_store, metrics, migrate, search
+from .json_provider import FastJSONProvider
 
 
 def create_app(config_object: type[DevelopmentConfig] = DevelopmentConfig) -> Flask:
     """Crea y configura la aplicacion utilizando application factory."""
     app = Flask(__name__)
     app.config.from_object(config_object)
+    app.json = FastJSONProvider(app)
 
     register_extensions(app)
     register_blueprints(app)
+    register_commands(app)
     CORS(app)
 
     return app
@@ -20,16 +23,37 @@ def create_app(config_object: type[DevelopmentConfig] = DevelopmentConfig) -> Fl
 
 def register_extensions(app: Flask) -> None:
     """Inicializa extensiones de terceros."""
+    from .pool import init_pool
+
+    init_pool(app)
     db.init_app(app)
     migrate.init_app(app, db)
+    cache.init_app(app)
+    idempotency_store.init_app(app)
+    continue_watching_store.init_app(app)
+    search.init_app(app)
+    metrics.init_app(app)
 
     # Importa los modelos aquí para que Alembic los detecte
-    from src.models import Movie, Series, Season, User, WatchEntry
+    from src.models import Genre, Movie, Series, Season, User, UserWatchStats, WatchEntry
     # No necesitas usarlos, solo importarlos
 
+    from .search import register_model_events
+    from .sql import init_sqlite
+
+    register_model_events()
+    init_sqlite(app)
+
 
 def register_blueprints(app: Flask) -> None:
     """Registra los blueprints del proyecto."""
     from .api import register_api_blueprints
 
     register_api_blueprints(app)
+
+
+def register_commands(app: Flask) -> None:
+    """Agrega los comandos propios a `flask` (junto a `flask db`)."""
+    from .cli import catalog_cli
+
+    app.cli.add_command(catalog_cli)
@@ -8,11 +8,13 @@ def register_api_blueprints(app: Flask) -> None:
     from .health import bp as health_bp
     from .movies import bp as movies_bp
     from .progress import bp as progress_bp
+    from .search import bp as search_bp
     from .series import bp as series_bp
 
     app.register_blueprint(health_bp)
     app.register_blueprint(movies_bp)
     app.register_blueprint(progress_bp)
+    app.register_blueprint(search_bp)
     app.register_blueprint(series_bp)
 
 
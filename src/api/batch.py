@@ -0,0 +1,74 @@
+"""Lecturas por lote ("get many"): varios ids en una sola consulta y campos a elegir."""
+
+from __future__ import annotations
+
+from typing import Collection, Iterable, Sequence
+
+from flask import current_app, request
+
+
+def parse_ids(value) -> list[int]:
+    """Acepta `"1,2,3"` o `[1, 2, 3]`; quita repetidos conservando el orden."""
+    if isinstance(value, str):
+        try:
+            value = [int(part) for part in value.split(",") if part.strip()]
+        except ValueError as exc:
+            raise ValueError("El parametro 'ids' debe ser una lista de ids") from exc
+    if not isinstance(value, list) or not all(
+        isinstance(v, int) and not isinstance(v, bool) for v in value
+    ):
+        raise ValueError("El parametro 'ids' debe ser una lista de ids")
+    ids = list(dict.fromkeys(value))
+    if not ids:
+        raise ValueError("El parametro 'ids' es obligatorio")
+    max_ids = current_app.config["BATCH_MAX_IDS"]
+    if len(ids) > max_ids:
+        raise ValueError(f"Se admiten como maximo {max_ids} ids por peticion")
+    return ids
+
+
+def parse_fields(value, allowed: Sequence[str], ignored: Collection[str] = ()) -> list[str] | None:
+    """Traduce `fields=id,title` a la lista de campos pedidos (None = todos).
+
+    Los nombres de `ignored` (campos de otro recurso del catalogo) se descartan
+    sin error; cualquier otro campo desconocido es un ValueError.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = [part.strip() for part in value.split(",") if part.strip()]
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError("El parametro 'fields' debe ser una lista de campos")
+    unknown = [name for name in value if name not in allowed and name not in ignored]
+    if unknown:
+        raise ValueError(f"Campos desconocidos: {', '.join(unknown)}")
+    value = [name for name in value if name in allowed]
+    # El id siempre se devuelve para que el cliente pueda asociar cada elemento.
+    return list(dict.fromkeys(["id", *value]))
+
+
+def get_batch_args(
+    allowed: Sequence[str], ignored: Collection[str] = ()
+) -> tuple[list[int], list[str] | None]:
+    """Lee `ids` y `fields` de la query string (GET) o del cuerpo JSON (POST)."""
+    if request.method == "POST":
+        payload = request.get_json(silent=True) or {}
+        return parse_ids(payload.get("ids")), parse_fields(payload.get("fields"), allowed, ignored)
+    return (
+        parse_ids(request.args.get("ids", "")),
+        parse_fields(request.args.get("fields"), allowed, ignored),
+    )
+
+
+def select_columns(columns: Iterable, fields: list[str] | None) -> list:
+    """Recorta las columnas del SELECT a los campos pedidos."""
+    return [column for column in columns if fields is None or column.name in fields]
+
+
+def in_request_order(rows: Iterable[dict], ids: list[int]) -> dict:
+    """Ordena las filas como los ids pedidos y lista los que no existen."""
+    by_id = {row["id"]: row for row in rows}
+    return {
+        "items": [by_id[item_id] for item_id in ids if item_id in by_id],
+        "missing": [item_id for item_id in ids if item_id not in by_id],
+    }
@@ -0,0 +1,44 @@
+"""Soporte de GET condicional (ETag / Last-Modified) basado en `updated_at`."""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Callable, Sequence
+
+from flask import Response, make_response, request
+
+
+def compute_etag(parts: Sequence[Any]) -> str:
+    """Resume las partes que identifican la version de un recurso en un ETag corto."""
+    return hashlib.blake2b(repr(tuple(parts)).encode(), digest_size=12).hexdigest()
+
+
+def conditional_response(
+    parts: Sequence[Any],
+    last_modified: datetime | None,
+    build: Callable[[], Any],
+) -> Response:
+    """Responde 304 si el cliente ya tiene esta version; si no, construye la respuesta."""
+    etag = compute_etag(parts)
+    if last_modified is not None and last_modified.tzinfo is None:
+        # Las columnas updated_at se guardan en UTC sin zona horaria.
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+    if _is_fresh(etag, last_modified):
+        response = Response(status=304)
+    else:
+        response = make_response(build())
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+
+def _is_fresh(etag: str, last_modified: datetime | None) -> bool:
+    """Aplica las reglas de RFC 9110: If-None-Match tiene prioridad sobre If-Modified-Since."""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
@@ -1,12 +1,155 @@
 """Endpoints de verificacion rapida de la API."""
 
-from flask import Blueprint, jsonify
+from __future__ import annotations
+
+import math
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from flask import Blueprint, current_app, jsonify
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from src.extensions import cache, db
+from src.pool import pool_stats
 
 bp = Blueprint("health", __name__, url_prefix="/health")
 
+# Cuerpo fijo: el liveness no toca la base ni arma estructuras por peticion.
+_LIVE_BODY = b'{"status":"ok"}\n'
+# Respuesta mientras corre la primera comprobacion del worker (aun no hay resultado).
+_PROBING = {"status": "unavailable", "checks": {"probe": {"ok": False, "error": "Comprobacion en curso"}}}
+
+
+@lru_cache(maxsize=None)
+def _migration_heads(directory: str) -> tuple[str, ...]:
+    """Lee los heads del directorio de migraciones una sola vez por proceso."""
+    return tuple(sorted(ScriptDirectory(directory).get_heads()))
+
+
+class HealthService:
+    """Calcula la readiness del worker y la recuerda unos segundos."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def readiness(self) -> dict:
+        state = current_app.extensions.setdefault(
+            "health", {"expires": 0.0, "result": None, "engine": None}
+        )
+        if state["result"] is not None and time.monotonic() < state["expires"]:
+            return state["result"]
+        # Un solo probe a la vez; las demas peticiones no esperan el lock y
+        # responden con el ultimo resultado aunque este vencido.
+        if not self._lock.acquire(blocking=False):
+            return state["result"] or _PROBING
+        try:
+            if state["result"] is None or time.monotonic() >= state["expires"]:
+                if state["engine"] is None:
+                    state["engine"] = _probe_engine(current_app.config["HEALTH_DB_TIMEOUT_MS"])
+                state["result"] = self._probe(state["engine"])
+                state["expires"] = time.monotonic() + current_app.config["HEALTH_CACHE_SECONDS"]
+            return state["result"]
+        finally:
+            self._lock.release()
+
+    def _probe(self, engine) -> dict:
+        checks = {"pool": self._check_pool()}
+        # Con el pool lleno el checkout esperaria `pool_timeout`; se informa sin esperar.
+        if checks["pool"]["saturated"]:
+            checks["database"] = {"ok": False, "error": "Pool de conexiones agotado"}
+        else:
+            checks.update(self._check_database(engine))
+        ready = checks["pool"]["ok"] and checks["database"]["ok"]
+        if current_app.config["HEALTH_REQUIRE_MIGRATIONS"]:
+            ready = ready and checks.get("migrations", {}).get("ok", False)
+        return {"status": "ready" if ready else "unavailable", "checks": checks}
+
+    @staticmethod
+    def _check_pool() -> dict:
+        stats = pool_stats(db.engine)
+        capacity = stats.get("size", 0) + stats.get("max_overflow", 0)
+        in_use = stats.get("checked_out", 0)
+        saturation = in_use / capacity if capacity else 0.0
+        saturated = bool(capacity) and in_use >= capacity
+        return {"ok": not saturated, "saturated": saturated, "saturation": round(saturation, 3), **stats}
+
+    @staticmethod
+    def _check_database(engine) -> dict:
+        timeout_ms = current_app.config["HEALTH_DB_TIMEOUT_MS"]
+        start = time.perf_counter()
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                current = MigrationContext.configure(connection).get_current_revision()
+        except Exception as exc:
+            return {"database": {"ok": False, "error": str(exc).splitlines()[0]}}
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        database = {"ok": elapsed_ms <= timeout_ms, "latency_ms": round(elapsed_ms, 2)}
+
+        directory = Path(current_app.extensions["migrate"].directory)
+        if not directory.is_absolute():
+            directory = Path(current_app.root_path).parent / directory
+        try:
+            heads = _migration_heads(str(directory))
+        except Exception as exc:
+            return {"database": database, "migrations": {"ok": False, "error": str(exc)}}
+        migrations = {"ok": (current,) == heads, "current": current, "head": list(heads)}
+        return {"database": database, "migrations": migrations}
+
+
+def _probe_engine(timeout_ms: int):
+    """Engine sin pool para el probe, con `HEALTH_DB_TIMEOUT_MS` tambien al conectar.
+
+    Un `statement_timeout` solo rige con la conexion ya abierta: sin
+    `connect_timeout` una base inalcanzable bloquearia el probe en el connect.
+    """
+    engine = db.engine
+    url = engine.url
+    if engine.dialect.name == "sqlite":
+        if not url.database or url.database == ":memory:":
+            # La base en memoria solo existe en la conexion de la app.
+            return engine
+        # Espera maxima por un lock de escritura al leer alembic_version.
+        connect_args = {"timeout": timeout_ms / 1000}
+    elif engine.dialect.name == "postgresql":
+        connect_args = {
+            # libpq solo admite segundos enteros (y trata 1 como 2).
+            "connect_timeout": max(1, math.ceil(timeout_ms / 1000)),
+            "options": f"-c statement_timeout={int(timeout_ms)}",
+        }
+    else:
+        connect_args = {}
+    return create_engine(url, poolclass=NullPool, connect_args=connect_args)
+
+
+service = HealthService()
+
 
 @bp.get("/")
-def healthcheck() -> tuple[dict[str, str], int]:
-    """Devuelve el estado actual de la aplicacion."""
-    # TODO: agregar comprobaciones reales (db, cache, servicios externos).
-    return jsonify({"status": "ok"}), 200
+def healthcheck():
+    """Liveness: el proceso responde; no consulta dependencias."""
+    return current_app.response_class(_LIVE_BODY, mimetype="application/json")
+
+
+@bp.get("/ready")
+def readiness():
+    """Readiness: base alcanzable, pool con margen y migraciones al dia."""
+    result = service.readiness()
+    return jsonify(result), 200 if result["status"] == "ready" else 503
+
+
+@bp.get("/cache")
+def cache_stats():
+    """Expone los contadores de aciertos y fallos del cache."""
+    return jsonify(cache.stats()), 200
+
+
+@bp.get("/pool")
+def pool_gauges():
+    """Expone el uso del pool de conexiones (en uso, overflow, espera de checkout)."""
+    return jsonify(pool_stats(db.engine)), 200
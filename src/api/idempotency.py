@@ -0,0 +1,56 @@
+"""Reintentos seguros de escrituras con el header `Idempotency-Key`."""
+
+from __future__ import annotations
+
+import hashlib
+from functools import wraps
+from typing import Callable
+
+from flask import current_app, jsonify, make_response, request
+
+from src.extensions import idempotency_store
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def idempotent(view: Callable) -> Callable:
+    """Guarda la respuesta exitosa de la vista y la repite ante la misma clave.
+
+    La clave se asocia al usuario (`X-User-Id`); reutilizarla con otra ruta o
+    cuerpo responde 422 para no devolver un resultado ajeno.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view(*args, **kwargs)
+        if len(key) > 255:
+            return jsonify({"error": "Idempotency-Key demasiado larga"}), 400
+
+        cache_key = f"idempotency:{request.headers.get('X-User-Id', '')}:{key}"
+        fingerprint = hashlib.blake2b(
+            b"\0".join([request.method.encode(), request.path.encode(), request.get_data()]),
+            digest_size=12,
+        ).hexdigest()
+        stored = idempotency_store.get(cache_key)
+        if stored is not None:
+            if stored["fingerprint"] != fingerprint:
+                return jsonify({"error": "Idempotency-Key ya usada con otra peticion"}), 422
+            response = current_app.response_class(
+                stored["body"], status=stored["status"], mimetype="application/json"
+            )
+            response.headers["Idempotent-Replayed"] = "true"
+            return response
+
+        response = make_response(view(*args, **kwargs))
+        # Solo se recuerdan los exitos; un error puede dejar de serlo en el reintento.
+        if 200 <= response.status_code < 300:
+            idempotency_store.set(
+                cache_key,
+                {"fingerprint": fingerprint, "status": response.status_code, "body": response.get_data()},
+                current_app.config["IDEMPOTENCY_TTL"],
+            )
+        return response
+
+    return wrapper
@@ -1,20 +1,106 @@
 """Endpoints relacionados con peliculas."""
 
 from __future__ import annotations
-from flask import Blueprint, jsonify, request
-from src.extensions import db
-from src.models import Movie
+from typing import Iterator
+
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import func, select
+from src.api.batch import get_batch_args, in_request_order, select_columns
+from src.api.conditional import conditional_response
+from src.api.pagination import apply_keyset, build_page, get_page_args, parse_sort
+from src.api.streaming import stream_ndjson, wants_stream
+from src.extensions import cache, db
+from src.json_provider import pre_encode
+from src.models import Movie, Series
 
 bp = Blueprint("movies", __name__, url_prefix="/movies")
 
+MOVIE_FIELDS = [column.name for column in Movie.public_columns()]
+# Campos que solo tienen las series (image_url, seasons...): se ignoran para que el
+# cliente pueda pedir los mismos `fields` a /movies y /series.
+SERIES_ONLY_FIELDS = {column.name for column in Series.public_columns()} | {"seasons"}
+
+
+def movie_cache_key(movie_id: int) -> str:
+    """Clave de cache del detalle de una pelicula."""
+    return f"movie:{movie_id}"
+
 
 class MovieService:
     """Orquesta la logica de negocio para el recurso Movie."""
 
-    def list_movies(self) -> list[dict]:
-        """Retorna todas las peliculas registradas."""
-        movies = Movie.query.all()
-        return [m.to_dict() for m in movies]
+    def list_movies(
+        self,
+        limit: int,
+        after: str | None = None,
+        filters: dict | None = None,
+        sort: str | None = None,
+    ) -> dict:
+        """Retorna una pagina de peliculas filtradas y ordenadas en la base."""
+        # Lectura con Core: filas -> dict sin hidratar objetos ORM.
+        stmt, scope, columns = self._page_query(Movie.public_columns(), limit, after, filters, sort)
+        rows = db.session.execute(stmt).mappings().all()
+        movies, next_cursor = build_page(
+            rows, limit, lambda m: [m[column.name] for column in columns], scope
+        )
+        return {"items": [dict(m) for m in movies], "next_cursor": next_cursor}
+
+    def page_version(
+        self,
+        limit: int,
+        after: str | None = None,
+        filters: dict | None = None,
+        sort: str | None = None,
+    ) -> tuple:
+        """Devuelve (max(updated_at), count, max(id)) de la pagina sin serializarla."""
+        c = Movie.__table__.c
+        stmt, _, _ = self._page_query([c.id, c.updated_at], limit, after, filters, sort)
+        page = stmt.subquery()
+        return tuple(
+            db.session.execute(
+                select(func.max(page.c.updated_at), func.count(), func.max(page.c.id))
+            ).one()
+        )
+
+    def get_many(self, ids: list[int], fields: list[str] | None = None) -> dict:
+        """Obtiene varias peliculas con un unico SELECT ... IN, solo con los campos pedidos."""
+        columns = select_columns(Movie.public_columns(), fields)
+        rows = db.session.execute(
+            select(*columns).where(Movie.__table__.c.id.in_(ids))
+        ).mappings()
+        return in_request_order((dict(row) for row in rows), ids)
+
+    def iter_movies(self, filters: dict | None = None) -> Iterator[dict]:
+        """Recorre todo el catalogo con un cursor del lado del servidor."""
+        stmt = (
+            self._filtered(select(*Movie.public_columns()), filters)
+            .order_by(Movie.__table__.c.id)
+            .execution_options(yield_per=current_app.config["STREAM_YIELD_PER"])
+        )
+        for row in db.session.execute(stmt).mappings():
+            yield dict(row)
+
+    def _page_query(self, columns, limit, after, filters, sort):
+        c = Movie.__table__.c
+        sortable = {"id": c.id, "title": c.title, "release_year": c.release_year, "updated_at": c.updated_at}
+        order, descending, scope = parse_sort(sort, sortable, c.id)
+        # Las columnas del cursor tienen que estar en el SELECT.
+        columns = list(columns) + [col for col in order if not any(col is existing for existing in columns)]
+        stmt = apply_keyset(self._filtered(select(*columns), filters), order, after, limit, descending, scope)
+        return stmt, scope, order
+
+    @staticmethod
+    def _filtered(stmt, filters: dict | None):
+        """Traduce los filtros a WHERE indexables."""
+        c = Movie.__table__.c
+        filters = filters or {}
+        if filters.get("genre"):
+            stmt = stmt.where(func.lower(c.genre) == filters["genre"].strip().lower())
+        if filters.get("year_from") is not None:
+            stmt = stmt.where(c.release_year >= filters["year_from"])
+        if filters.get("year_to") is not None:
+            stmt = stmt.where(c.release_year <= filters["year_to"])
+        return stmt
 
     def create_movie(self, payload: dict) -> dict:
         """Crea una nueva pelicula."""
@@ -28,14 +114,20 @@ class MovieService:
         )
         db.session.add(movie)
         db.session.commit()
+        # SQLite puede reutilizar el id de una pelicula borrada.
+        cache.delete(movie_cache_key(movie.id))
         return movie.to_dict()
 
     def get_movie(self, movie_id: int) -> dict:
-        """Obtiene una pelicula por su identificador."""
+        """Obtiene una pelicula por su identificador (pasando por el cache)."""
+        return cache.get_or_set(movie_cache_key(movie_id), lambda: self._load_movie(movie_id))
+
+    def _load_movie(self, movie_id: int) -> dict:
         movie = Movie.query.get(movie_id)
         if not movie:
             raise LookupError("Película no encontrada")
-        return movie.to_dict()
+        # Se cachea ya serializada: los aciertos no vuelven a codificar JSON.
+        return pre_encode(movie.to_dict())
 
     def update_movie(self, movie_id: int, payload: dict) -> dict:
         """Actualiza los datos de una pelicula."""
@@ -47,6 +139,7 @@ class MovieService:
         movie.genre = payload.get("genre", movie.genre)
         movie.release_year = payload.get("release_year", movie.release_year)
         db.session.commit()
+        cache.delete(movie_cache_key(movie_id))
         return movie.to_dict()
 
     def delete_movie(self, movie_id: int) -> None:
@@ -56,6 +149,7 @@ class MovieService:
             raise LookupError("Película no encontrada")
         db.session.delete(movie)
         db.session.commit()
+        cache.delete(movie_cache_key(movie_id))
 
 
 service = MovieService()
@@ -63,9 +157,35 @@ service = MovieService()
 
 @bp.get("/")
 def list_movies():
+    if "ids" in request.args:
+        return batch_movies()
+    filters = {
+        "genre": request.args.get("genre"),
+        "year_from": request.args.get("year_from", type=int),
+        "year_to": request.args.get("year_to", type=int),
+    }
+    sort = request.args.get("sort")
+    if wants_stream():
+        return stream_ndjson(service.iter_movies(filters))
     try:
-        movies = service.list_movies()
-        return jsonify(movies), 200
+        limit, after = get_page_args()
+        last_modified, *version = service.page_version(limit, after, filters, sort)
+        return conditional_response(
+            ("movies", limit, after, sorted(filters.items()), sort, last_modified, *version),
+            # Sin Last-Modified: un borrado no cambia el max(updated_at) de la pagina
+            # y If-Modified-Since responderia 304; el ETag incluye count y max(id).
+            None,
+            lambda: (jsonify(service.list_movies(limit, after, filters, sort)), 200),
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@bp.post("/batch")
+def batch_movies():
+    try:
+        ids, fields = get_batch_args(MOVIE_FIELDS, SERIES_ONLY_FIELDS)
+        return jsonify(service.get_many(ids, fields)), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
@@ -84,7 +204,11 @@ def create_movie():
 def retrieve_movie(movie_id: int):
     try:
         movie = service.get_movie(movie_id)
-        return jsonify(movie), 200
+        return conditional_response(
+            ("movie", movie["id"], movie["updated_at"]),
+            movie["updated_at"],
+            lambda: (jsonify(movie), 200),
+        )
     except LookupError as e:
         return jsonify({"error": str(e)}), 404
 
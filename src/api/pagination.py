@@ -0,0 +1,149 @@
+"""Utilidades de paginacion por cursor (keyset) para los listados."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, Sequence
+
+from flask import current_app, request
+from sqlalchemy import DateTime, select, tuple_, union_all
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Codifica los valores de la ultima fila en un cursor opaco."""
+    raw = json.dumps(list(values), separators=(",", ":"), default=_encode_value).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Recupera los valores guardados en un cursor generado por `encode_cursor`."""
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, binascii.Error) as exc:
+        raise ValueError("Cursor invalido") from exc
+    if not isinstance(values, list):
+        raise ValueError("Cursor invalido")
+    return values
+
+
+def get_page_args() -> tuple[int, str | None]:
+    """Lee `limit` y `after` de la query string respetando el maximo configurado."""
+    default_limit = current_app.config["PAGINATION_DEFAULT_LIMIT"]
+    max_limit = current_app.config["PAGINATION_MAX_LIMIT"]
+    limit = request.args.get("limit", default_limit, type=int)
+    if limit < 1:
+        raise ValueError("El parametro 'limit' debe ser mayor a 0")
+    return min(limit, max_limit), request.args.get("after") or None
+
+
+def parse_sort(sort: str | None, sortable: dict, key) -> tuple[list, bool, str]:
+    """Traduce `sort=campo` o `sort=-campo` a las columnas del keyset (campo, id)."""
+    sort = sort or "id"
+    descending = sort.startswith("-")
+    name = sort.lstrip("-")
+    if name not in sortable:
+        raise ValueError(f"No se puede ordenar por '{name}'")
+    column = sortable[name]
+    columns = [key] if column is key else [column, key]
+    return columns, descending, sort
+
+
+def apply_keyset(stmt, columns, after: str | None, limit: int, descending: bool = False, scope: str = "id"):
+    """Filtra y ordena `stmt` para devolver la pagina que sigue al cursor.
+
+    `columns` es `[id]` o `[campo, id]`; el id desempata y debe ser unico. Los
+    NULL del campo de orden van siempre al final.
+    """
+    if not isinstance(columns, (list, tuple)):
+        columns = [columns]
+    values = None
+    if after:
+        values = decode_cursor(after)
+        if len(values) != len(columns) + 1 or values[0] != scope:
+            raise ValueError("Cursor invalido")
+        values = [_coerce(columns[0], values[1]), *values[2:]]
+
+    if len(columns) > 1 and columns[0].nullable:
+        return _nulls_last_page(stmt, columns, values, limit, descending)
+    if values is not None:
+        stmt = stmt.where(_after(columns, values, descending))
+    # Se pide una fila extra para saber si existe una pagina siguiente.
+    return stmt.order_by(*_order(columns, descending)).limit(limit + 1)
+
+
+def build_page(
+    rows: list,
+    limit: int,
+    key: Callable[[Any], Sequence[Any]],
+    scope: str = "id",
+) -> tuple[list, str | None]:
+    """Recorta la fila extra y calcula el cursor de la pagina siguiente."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([scope, *key(rows[-1])])
+
+
+def _order(columns: Sequence, descending: bool) -> list:
+    return [column.desc() if descending else column.asc() for column in columns]
+
+
+def _after(columns: Sequence, values: Sequence[Any], descending: bool):
+    """Condicion "fila posterior al cursor" como comparacion de filas `(campo, id) > (v, k)`.
+
+    A diferencia de `campo > v OR (campo = v AND id > k)`, la comparacion de
+    filas se resuelve como un rango del indice (campo, id) y no como un SCAN.
+    """
+    if len(columns) == 1:
+        target, value = columns[0], values[0]
+    else:
+        target, value = tuple_(*columns), tuple_(*values)
+    return target < value if descending else target > value
+
+
+def _nulls_last_page(stmt, columns: Sequence, values: Sequence[Any] | None, limit: int, descending: bool):
+    """Pagina sobre un campo con NULL en dos tramos, cada uno con busqueda por indice.
+
+    Un unico WHERE `... OR campo IS NULL` obliga a recorrer el indice desde el
+    principio. Se leen por separado las filas con valor (desde el cursor) y las
+    filas NULL (ordenadas por id) y se unen: el orden final solo ordena las
+    `2 * (limit + 1)` filas como maximo que devuelven los dos tramos.
+    """
+    column, key = columns
+    parts = []
+    if values is None or values[0] is not None:
+        valued = stmt.where(column.is_not(None))
+        if values is not None:
+            valued = valued.where(_after(columns, values, descending))
+        parts.append(valued.order_by(*_order(columns, descending)).limit(limit + 1))
+    nulls = stmt.where(column.is_(None))
+    if values is not None and values[0] is None:
+        nulls = nulls.where(_after([key], values[1:], descending))
+    parts.append(nulls.order_by(*_order([key], descending)).limit(limit + 1))
+
+    if len(parts) == 1:
+        return parts[0]
+    page = union_all(*(select(part.subquery()) for part in parts)).subquery()
+    order = _order([page.c[column.name], page.c[key.name]], descending)
+    order[0] = order[0].nulls_last()
+    return select(page).order_by(*order).limit(limit + 1)
+
+
+def _encode_value(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Valor no serializable en cursor: {value!r}")
+
+
+def _coerce(column, value: Any) -> Any:
+    """Recupera el tipo original de los valores que JSON no conserva (fechas)."""
+    if value is not None and isinstance(column.type, DateTime):
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError) as exc:
+            raise ValueError("Cursor invalido") from exc
+    return value
@@ -1,60 +1,410 @@
 """Endpoints para controlar el progreso de los usuarios."""
 
 from __future__ import annotations
-from flask import Blueprint, jsonify, request
-from src.extensions import db
-from src.models import User, Movie, Series, WatchEntry
+from datetime import datetime
+from typing import Iterator
+
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import case, func, literal, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from src.api.conditional import conditional_response
+from src.api.idempotency import idempotent
+from src.api.streaming import stream_ndjson, wants_stream
+from src.extensions import continue_watching_store, db
+from src.json_provider import pre_encode
+from src.models import User, Movie, Season, Series, UserWatchStats, WatchEntry
+from src.sql import dialect_insert
 
 bp = Blueprint("progress", __name__, url_prefix="/")
 
 
+def continue_watching_cache_key(user_id: int) -> str:
+    """Clave de cache de "seguir viendo" de un usuario."""
+    return f"continue-watching:{user_id}"
+
+
+def _least(a, b):
+    """LEAST(a, b) portable entre SQLite y Postgres."""
+    return case((a < b, a), else_=b)
+
+
 class ProgressService:
     """Coordina operaciones sobre la lista de seguimiento y progreso."""
 
-    def list_watchlist(self, user_id: int) -> list[dict]:
-        entries = WatchEntry.query.filter_by(user_id=user_id).all()
-        return [e.to_dict() for e in entries]
+    # Valores aceptados por `?expand=`: agregan datos del catalogo a cada entrada.
+    EXPANDABLE = {"title"}
+
+    @classmethod
+    def parse_expand(cls, value: str | None) -> frozenset[str]:
+        """Traduce `expand=title` al conjunto de expansiones pedidas."""
+        names = frozenset(part.strip() for part in (value or "").split(",") if part.strip())
+        unknown = names - cls.EXPANDABLE
+        if unknown:
+            raise ValueError(f"No se puede expandir: {', '.join(sorted(unknown))}")
+        return names
+
+    def list_watchlist(self, user_id: int, expand: frozenset[str] = frozenset()) -> list[dict]:
+        # Lectura con Core; percentage_watched se calcula en SQL.
+        stmt = self._watchlist_query(user_id, expand)
+        return [dict(row) for row in db.session.execute(stmt).mappings()]
+
+    def watchlist_version(self, user_id: int, expand: frozenset[str] = frozenset()) -> tuple:
+        """Devuelve (max(updated_at), count) usando el indice (user_id, updated_at).
+
+        Con `expand=title` la version tambien depende de las peliculas y series
+        de la watchlist, para que editar un titulo invalide el ETag.
+        """
+        c = WatchEntry.__table__.c
+        if "title" not in expand:
+            return tuple(
+                db.session.execute(
+                    select(func.max(c.updated_at), func.count()).where(c.user_id == user_id)
+                ).one()
+            )
+        movies, series = Movie.__table__, Series.__table__
+        entries, count, movie_updated, series_updated = db.session.execute(
+            select(
+                func.max(c.updated_at),
+                func.count(),
+                func.max(movies.c.updated_at),
+                func.max(series.c.updated_at),
+            )
+            .select_from(self._with_titles(WatchEntry.__table__))
+            .where(c.user_id == user_id)
+        ).one()
+        changes = [value for value in (entries, movie_updated, series_updated) if value is not None]
+        return max(changes, default=None), count, movie_updated, series_updated
+
+    def iter_watchlist(self, user_id: int, expand: frozenset[str] = frozenset()) -> Iterator[dict]:
+        """Recorre la watchlist completa del usuario sin materializarla en memoria."""
+        stmt = (
+            self._watchlist_query(user_id, expand)
+            .order_by(WatchEntry.__table__.c.id)
+            .execution_options(yield_per=current_app.config["STREAM_YIELD_PER"])
+        )
+        for row in db.session.execute(stmt).mappings():
+            yield dict(row)
+
+    def _watchlist_query(self, user_id: int, expand: frozenset[str]):
+        """SELECT de la watchlist; con `title` une peliculas y series en la misma consulta."""
+        columns = WatchEntry.public_columns()
+        source = WatchEntry.__table__
+        if "title" in expand:
+            movies, series = Movie.__table__, Series.__table__
+            columns += [
+                func.coalesce(movies.c.title, series.c.title).label("title"),
+                series.c.image_url.label("image_url"),
+            ]
+            source = self._with_titles(source)
+        return select(*columns).select_from(source).where(WatchEntry.__table__.c.user_id == user_id)
+
+    @staticmethod
+    def _with_titles(entries):
+        """LEFT JOIN a movies y series: cada entrada apunta a una sola de las dos."""
+        movies, series = Movie.__table__, Series.__table__
+        return entries.outerjoin(movies, movies.c.id == entries.c.movie_id).outerjoin(
+            series, series.c.id == entries.c.series_id
+        )
+
+    def continue_watching(self, user_id: int) -> dict:
+        """Entradas en curso mas recientes del usuario (pasando por el cache)."""
+        return continue_watching_store.get_or_set(
+            continue_watching_cache_key(user_id),
+            lambda: self._load_continue_watching(user_id),
+            current_app.config["CONTINUE_WATCHING_TTL"],
+        )
+
+    def _load_continue_watching(self, user_id: int) -> dict:
+        """Una sola consulta sobre el indice (user_id, status, last_activity_at DESC, id DESC).
+
+        El siguiente episodio sigue la regla de `next_episode`: si la temporada
+        actual (LEFT JOIN seasons) ya termino, es el 1 de la siguiente.
+        """
+        c = WatchEntry.__table__.c
+        movies, series = Movie.__table__, Series.__table__
+        current = Season.__table__.alias("current_season")
+        season_finished = func.coalesce(c.current_episode, 0) >= func.coalesce(
+            current.c.episodes_count, 0
+        )
+        is_series = c.series_id.is_not(None)
+        stmt = (
+            select(
+                *WatchEntry.public_columns(),
+                func.coalesce(movies.c.title, series.c.title).label("title"),
+                series.c.image_url.label("image_url"),
+                c.last_activity_at,
+                case(
+                    (is_series & season_finished, func.coalesce(c.current_season, 0) + 1),
+                    (is_series, c.current_season),
+                ).label("next_season"),
+                case(
+                    (is_series & season_finished, 1),
+                    (is_series, func.coalesce(c.current_episode, 0) + 1),
+                ).label("next_episode"),
+            )
+            .select_from(
+                self._with_titles(WatchEntry.__table__).outerjoin(
+                    current,
+                    (current.c.series_id == c.series_id) & (current.c.number == c.current_season),
+                )
+            )
+            .where(c.user_id == user_id, c.status == "in_progress")
+            .order_by(c.last_activity_at.desc(), c.id.desc())
+            .limit(current_app.config["CONTINUE_WATCHING_LIMIT"])
+        )
+        items = [dict(row) for row in db.session.execute(stmt).mappings()]
+        # Se cachea ya serializada: los aciertos no vuelven a codificar JSON.
+        return pre_encode({"items": items})
+
+    def add_movie(self, user_id: int, movie_id: int) -> tuple[dict, bool]:
+        """Agrega la pelicula si no estaba; devuelve (entrada, creada)."""
+        return self._upsert_entry(
+            user_id,
+            {"movie_id": movie_id, "total_episodes": 1},
+            WatchEntry.__table__.c.movie_id == movie_id,
+            "Usuario o película no encontrados",
+        )
+
+    def add_series(self, user_id: int, series_id: int) -> tuple[dict, bool]:
+        """Agrega la serie si no estaba; devuelve (entrada, creada)."""
+        total = select(Series.total_episodes).where(Series.id == series_id).scalar_subquery()
+        return self._upsert_entry(
+            user_id,
+            {"series_id": series_id, "total_episodes": total, "watched_episodes": 0},
+            WatchEntry.__table__.c.series_id == series_id,
+            "Usuario o serie no encontrados",
+        )
 
-    def add_movie(self, user_id: int, movie_id: int) -> dict:
-        user = User.query.get(user_id)
-        movie = Movie.query.get(movie_id)
-        if not user or not movie:
-            raise LookupError("Usuario o película no encontrados")
+    def _upsert_entry(self, user_id: int, values: dict, match, not_found: str) -> tuple[dict, bool]:
+        """INSERT ... ON CONFLICT DO NOTHING; si ya existia, devuelve la fila actual.
 
-        entry = WatchEntry(user_id=user_id, movie_id=movie_id, total_episodes=1)
-        db.session.add(entry)
+        La existencia del usuario y del contenido la validan las claves foraneas.
+        """
+        c = WatchEntry.__table__.c
+        stmt = (
+            dialect_insert(WatchEntry.__table__)
+            .values(user_id=user_id, **values)
+            .on_conflict_do_nothing()
+            .returning(*WatchEntry.public_columns())
+        )
+        try:
+            row = db.session.execute(stmt).mappings().first()
+        except IntegrityError as exc:
+            db.session.rollback()
+            raise LookupError(not_found) from exc
+        created = row is not None
+        if not created:
+            row = db.session.execute(
+                select(*WatchEntry.public_columns()).where(c.user_id == user_id, match)
+            ).mappings().one()
         db.session.commit()
-        return entry.to_dict()
-
-    def add_series(self, user_id: int, series_id: int) -> dict:
-        user = User.query.get(user_id)
-        series = Series.query.get(series_id)
-        if not user or not series:
-            raise LookupError("Usuario o serie no encontrados")
-
-        entry = WatchEntry(
-            user_id=user_id,
-            series_id=series_id,
-            total_episodes=0,
-            watched_episodes=0,
+        if created:
+            continue_watching_store.delete(continue_watching_cache_key(user_id))
+        return dict(row), created
+
+    def bulk_add(self, user_id: int, payload: dict) -> list[dict]:
+        """Agrega muchas peliculas y series en una sola transaccion."""
+        movie_ids = self._parse_ids(payload.get("movies"), "movies")
+        series_ids = self._parse_ids(payload.get("series"), "series")
+        if len(movie_ids) + len(series_ids) > current_app.config["WATCHLIST_BULK_MAX_ITEMS"]:
+            raise ValueError("Demasiados elementos en la importacion")
+        if not db.session.get(User, user_id):
+            raise LookupError("Usuario no encontrado")
+
+        # Una consulta IN por tabla para validar todo el lote.
+        found_movies = set(db.session.scalars(select(Movie.id).where(Movie.id.in_(movie_ids))))
+        series_totals = dict(
+            db.session.execute(
+                select(Series.id, Series.total_episodes).where(Series.id.in_(series_ids))
+            ).all()
         )
-        db.session.add(entry)
+        existing = db.session.execute(
+            select(WatchEntry.movie_id, WatchEntry.series_id).where(
+                WatchEntry.user_id == user_id,
+                or_(WatchEntry.movie_id.in_(movie_ids), WatchEntry.series_id.in_(series_ids)),
+            )
+        ).all()
+        existing_movies = {row.movie_id for row in existing if row.movie_id}
+        existing_series = {row.series_id for row in existing if row.series_id}
+
+        rows: list[dict] = []
+        results: list[dict] = []
+        for movie_id in movie_ids:
+            if movie_id not in found_movies:
+                status = "not_found"
+            elif movie_id in existing_movies:
+                status = "already_exists"
+            else:
+                status = "created"
+                rows.append({"user_id": user_id, "movie_id": movie_id, "series_id": None, "total_episodes": 1})
+            results.append({"type": "movie", "id": movie_id, "status": status})
+        for series_id in series_ids:
+            if series_id not in series_totals:
+                status = "not_found"
+            elif series_id in existing_series:
+                status = "already_exists"
+            else:
+                status = "created"
+                rows.append(
+                    {
+                        "user_id": user_id,
+                        "movie_id": None,
+                        "series_id": series_id,
+                        "total_episodes": series_totals[series_id],
+                    }
+                )
+            results.append({"type": "series", "id": series_id, "status": status})
+
+        if rows:
+            # executemany: todas las filas viajan en un unico INSERT por lote. Si
+            # otra peticion agrego la misma fila en paralelo, el conflicto se ignora.
+            db.session.execute(dialect_insert(WatchEntry.__table__).on_conflict_do_nothing(), rows)
         db.session.commit()
-        return entry.to_dict()
+        if rows:
+            continue_watching_store.delete(continue_watching_cache_key(user_id))
+        return results
+
+    @staticmethod
+    def _parse_ids(values, field: str) -> list[int]:
+        """Valida una lista de ids eliminando repetidos y conservando el orden."""
+        if values is None:
+            return []
+        if not isinstance(values, list) or not all(
+            isinstance(v, int) and not isinstance(v, bool) for v in values
+        ):
+            raise ValueError(f"El campo '{field}' debe ser una lista de ids")
+        return list(dict.fromkeys(values))
 
     def update_series_progress(self, user_id: int, series_id: int, payload: dict) -> dict:
-        entry = WatchEntry.query.filter_by(user_id=user_id, series_id=series_id).first()
-        if not entry:
+        """Fija el avance absoluto con un unico UPDATE ... RETURNING (sin leer antes)."""
+        c = WatchEntry.__table__.c
+        values: dict = {}
+        for field in ("total_episodes", "current_season", "current_episode"):
+            if field in payload:
+                values[field] = self._non_negative(payload, field)
+
+        if "total_episodes" in values:
+            total = literal(values["total_episodes"])
+        else:
+            total = func.coalesce(c.total_episodes, 0)
+        if "watched_episodes" in payload:
+            watched = literal(self._non_negative(payload, "watched_episodes"))
+        else:
+            watched = func.coalesce(c.watched_episodes, 0)
+        watched = case((total > 0, _least(watched, total)), else_=watched)
+        values["watched_episodes"] = watched
+        if "status" in payload:
+            values["status"] = payload["status"]
+        else:
+            values["status"] = case(((total > 0) & (watched >= total), "completed"), else_=c.status)
+        values["last_activity_at"] = datetime.utcnow()
+
+        stmt = (
+            update(WatchEntry.__table__)
+            .where(c.user_id == user_id, c.series_id == series_id)
+            .values(**values)
+            .returning(*WatchEntry.public_columns())
+        )
+        row = db.session.execute(stmt).mappings().first()
+        if row is None:
+            db.session.rollback()
             raise LookupError("Registro no encontrado")
+        db.session.commit()
+        continue_watching_store.delete(continue_watching_cache_key(user_id))
+        return dict(row)
 
-        entry.watched_episodes = min(
-            payload.get("watched_episodes", entry.watched_episodes),
-            entry.total_episodes or payload.get("total_episodes", 0),
+    def next_episode(self, user_id: int, series_id: int) -> dict:
+        """Suma un episodio visto y avanza la posicion con un unico UPDATE condicional.
+
+        Si la temporada actual termina se pasa al episodio 1 de la siguiente;
+        al llegar al total la entrada queda como `completed`.
+        """
+        c = WatchEntry.__table__.c
+        seasons = Season.__table__.c
+        watched = func.coalesce(c.watched_episodes, 0) + 1
+        total = func.coalesce(c.total_episodes, 0)
+        season_length = (
+            select(seasons.episodes_count)
+            .where(seasons.series_id == series_id, seasons.number == c.current_season)
+            .scalar_subquery()
+        )
+        season_finished = func.coalesce(c.current_episode, 0) >= func.coalesce(season_length, 0)
+        stmt = (
+            update(WatchEntry.__table__)
+            # Solo avanza si quedan episodios: sin lectura previa ni actualizaciones perdidas.
+            .where(
+                c.user_id == user_id,
+                c.series_id == series_id,
+                (total == 0) | (func.coalesce(c.watched_episodes, 0) < total),
+            )
+            .values(
+                watched_episodes=case((total > 0, _least(watched, total)), else_=watched),
+                current_season=case(
+                    (season_finished, func.coalesce(c.current_season, 0) + 1), else_=c.current_season
+                ),
+                current_episode=case((season_finished, 1), else_=func.coalesce(c.current_episode, 0) + 1),
+                status=case(((total > 0) & (watched >= total), "completed"), else_=c.status),
+                last_activity_at=datetime.utcnow(),
+            )
+            .returning(*WatchEntry.public_columns())
         )
-        entry.total_episodes = payload.get("total_episodes", entry.total_episodes)
-        entry.status = payload.get("status", entry.status)
+        row = db.session.execute(stmt).mappings().first()
         db.session.commit()
-        return entry.to_dict()
+        if row is not None:
+            continue_watching_store.delete(continue_watching_cache_key(user_id))
+            return dict(row)
+
+        # Sin filas: la entrada no existe o ya estaba completa.
+        entry = db.session.execute(
+            select(*WatchEntry.public_columns()).where(c.user_id == user_id, c.series_id == series_id)
+        ).mappings().first()
+        if entry is None:
+            raise LookupError("Registro no encontrado")
+        return dict(entry)
+
+    @staticmethod
+    def _non_negative(payload: dict, field: str) -> int:
+        value = payload[field]
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"El campo '{field}' debe ser un entero mayor o igual a 0")
+        return value
+
+    def get_stats(self, user_id: int) -> dict:
+        """Resumen de la watchlist: conteos por estado y avance global de episodios."""
+        if current_app.config["WATCHLIST_STATS_MATERIALIZED"]:
+            # Lee las pocas filas (una por estado) del resumen que mantienen los triggers.
+            c = UserWatchStats.__table__.c
+            stmt = select(c.status, c.entries, c.watched_episodes, c.total_episodes).where(
+                c.user_id == user_id, c.entries > 0
+            )
+        else:
+            # Un unico GROUP BY sobre el rango del indice por usuario.
+            c = WatchEntry.__table__.c
+            status = func.coalesce(c.status, "in_progress")
+            stmt = (
+                select(
+                    status,
+                    func.count(),
+                    func.sum(func.coalesce(c.watched_episodes, 0)),
+                    func.sum(func.coalesce(c.total_episodes, 0)),
+                )
+                .where(c.user_id == user_id)
+                .group_by(status)
+            )
+
+        by_status: dict[str, int] = {}
+        watched = total = 0
+        for status, entries, status_watched, status_total in db.session.execute(stmt):
+            by_status[status] = entries
+            watched += status_watched or 0
+            total += status_total or 0
+        return {
+            "entries": sum(by_status.values()),
+            "by_status": by_status,
+            "watched_episodes": watched,
+            "total_episodes": total,
+            "percentage_watched": min(watched / total * 100, 100.0) if total else 0.0,
+        }
 
 
 service = ProgressService()
@@ -66,32 +416,86 @@ def get_my_watchlist():
     if not user_id:
         return jsonify({"error": "Falta el header X-User-Id"}), 400
     try:
-        data = service.list_watchlist(user_id)
-        return jsonify(data), 200
+        expand = service.parse_expand(request.args.get("expand"))
+        last_modified, *version = service.watchlist_version(user_id, expand)
+        # Sin Last-Modified, como los listados del catalogo: solo el ETag cuenta las entradas.
+        if wants_stream():
+            return conditional_response(
+                ("watchlist-ndjson", user_id, sorted(expand), last_modified, *version),
+                None,
+                lambda: stream_ndjson(service.iter_watchlist(user_id, expand)),
+            )
+        return conditional_response(
+            ("watchlist", user_id, sorted(expand), last_modified, *version),
+            None,
+            lambda: (jsonify(service.list_watchlist(user_id, expand)), 200),
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@bp.get("/me/continue-watching")
+def get_continue_watching():
+    user_id = request.headers.get("X-User-Id", type=int)
+    if not user_id:
+        return jsonify({"error": "Falta el header X-User-Id"}), 400
+    try:
+        return jsonify(service.continue_watching(user_id)), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@bp.get("/me/stats")
+def get_my_stats():
+    user_id = request.headers.get("X-User-Id", type=int)
+    if not user_id:
+        return jsonify({"error": "Falta el header X-User-Id"}), 400
+    try:
+        return jsonify(service.get_stats(user_id)), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
 
 @bp.post("/watchlist/movies/<int:movie_id>")
+@idempotent
 def add_movie_to_watchlist(movie_id: int):
     user_id = request.headers.get("X-User-Id", type=int)
     if not user_id:
         return jsonify({"error": "Falta el header X-User-Id"}), 400
     try:
-        entry = service.add_movie(user_id, movie_id)
-        return jsonify(entry), 201
+        entry, created = service.add_movie(user_id, movie_id)
+        return jsonify(entry), 201 if created else 200
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
 
 @bp.post("/watchlist/series/<int:series_id>")
+@idempotent
 def add_series_to_watchlist(series_id: int):
     user_id = request.headers.get("X-User-Id", type=int)
     if not user_id:
         return jsonify({"error": "Falta el header X-User-Id"}), 400
     try:
-        entry = service.add_series(user_id, series_id)
-        return jsonify(entry), 201
+        entry, created = service.add_series(user_id, series_id)
+        return jsonify(entry), 201 if created else 200
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@bp.post("/watchlist/bulk")
+@idempotent
+def bulk_add_to_watchlist():
+    user_id = request.headers.get("X-User-Id", type=int)
+    if not user_id:
+        return jsonify({"error": "Falta el header X-User-Id"}), 400
+    payload = request.get_json(silent=True) or {}
+    try:
+        results = service.bulk_add(user_id, payload)
+        return jsonify({"results": results}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
@@ -107,3 +511,17 @@ def update_series_progress(series_id: int):
         return jsonify(entry), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 400
+
+
+@bp.post("/progress/series/<int:series_id>/next")
+def next_series_episode(series_id: int):
+    user_id = request.headers.get("X-User-Id", type=int)
+    if not user_id:
+        return jsonify({"error": "Falta el header X-User-Id"}), 400
+    try:
+        entry = service.next_episode(user_id, series_id)
+        return jsonify(entry), 200
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
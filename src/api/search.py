@@ -0,0 +1,43 @@
+"""Endpoint de busqueda sobre el catalogo."""
+
+from __future__ import annotations
+from flask import Blueprint, jsonify, request
+from src.api.pagination import decode_cursor, encode_cursor, get_page_args
+from src.extensions import search
+
+bp = Blueprint("search", __name__, url_prefix="/search")
+
+
+class SearchService:
+    """Busca peliculas y series por titulo, generos y sinopsis."""
+
+    def search(self, query: str, limit: int, after: str | None = None) -> dict:
+        if not query.strip():
+            raise ValueError("El parametro 'q' es obligatorio")
+        # El orden es por relevancia, asi que el cursor guarda la posicion.
+        offset = 0
+        if after:
+            values = decode_cursor(after)
+            if len(values) != 1 or not isinstance(values[0], int) or values[0] < 0:
+                raise ValueError("Cursor invalido")
+            offset = values[0]
+
+        results = search.search(query, limit + 1, offset)
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_cursor = encode_cursor([offset + limit])
+        return {"items": results, "next_cursor": next_cursor}
+
+
+service = SearchService()
+
+
+@bp.get("/")
+def search_catalog():
+    try:
+        limit, after = get_page_args()
+        data = service.search(request.args.get("q", ""), limit, after)
+        return jsonify(data), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
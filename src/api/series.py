@@ -1,19 +1,139 @@
 """Endpoints relacionados con series y temporadas."""
 
 from __future__ import annotations
-from flask import Blueprint, jsonify, request
-from src.extensions import db
-from src.models import Series, Season
+from typing import Iterator
+
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import selectinload
+from src.api.batch import get_batch_args, in_request_order, select_columns
+from src.api.conditional import conditional_response
+from src.api.pagination import apply_keyset, build_page, get_page_args, parse_sort
+from src.api.streaming import stream_ndjson, wants_stream
+from src.extensions import cache, db
+from src.json_provider import pre_encode
+from src.models import Genre, Movie, Series, Season, WatchEntry, series_genres
 
 bp = Blueprint("series", __name__, url_prefix="/series")
 
+SERIES_FIELDS = [column.name for column in Series.public_columns()] + ["seasons"]
+# Campos que solo tienen las peliculas (genre, release_year): se ignoran igual que
+# image_url en /movies.
+MOVIE_ONLY_FIELDS = {column.name for column in Movie.public_columns()}
+
+
+def series_cache_key(series_id: int) -> str:
+    """Clave de cache del detalle de una serie (incluye temporadas)."""
+    return f"series:{series_id}"
+
 
 class SeriesService:
     """Gestiona las operaciones CRUD sobre Series y Seasons."""
 
-    def list_series(self) -> list[dict]:
-        series = Series.query.all()
-        return [s.to_dict(include_seasons=True) for s in series]
+    def list_series(
+        self,
+        limit: int,
+        after: str | None = None,
+        filters: dict | None = None,
+        sort: str | None = None,
+    ) -> dict:
+        # Lectura con Core; las temporadas de toda la pagina llegan en un unico SELECT ... IN.
+        stmt, scope, columns = self._page_query(Series.public_columns(), limit, after, filters, sort)
+        rows = db.session.execute(stmt).mappings().all()
+        series, next_cursor = build_page(
+            rows, limit, lambda s: [s[column.name] for column in columns], scope
+        )
+        return {"items": self._with_seasons(series), "next_cursor": next_cursor}
+
+    def page_version(
+        self,
+        limit: int,
+        after: str | None = None,
+        filters: dict | None = None,
+        sort: str | None = None,
+    ) -> tuple:
+        """Devuelve (max(updated_at), count, max(id), temporadas) de la pagina sin serializarla."""
+        c = Series.__table__.c
+        stmt, _, _ = self._page_query([c.id, c.updated_at], limit, after, filters, sort)
+        page = stmt.subquery()
+        seasons = (
+            select(func.count())
+            .select_from(Season.__table__)
+            .where(Season.__table__.c.series_id.in_(select(page.c.id)))
+            .scalar_subquery()
+        )
+        return tuple(
+            db.session.execute(
+                select(func.max(page.c.updated_at), func.count(), func.max(page.c.id), seasons)
+            ).one()
+        )
+
+    def get_many(self, ids: list[int], fields: list[str] | None = None) -> dict:
+        """Obtiene varias series con un SELECT ... IN; las temporadas, si se piden, en otro."""
+        columns = select_columns(Series.public_columns(), fields)
+        rows = db.session.execute(
+            select(*columns).where(Series.__table__.c.id.in_(ids))
+        ).mappings().all()
+        if fields is None or "seasons" in fields:
+            items = self._with_seasons(rows)
+        else:
+            items = [dict(row) for row in rows]
+        return in_request_order(items, ids)
+
+    def iter_series(self, filters: dict | None = None) -> Iterator[dict]:
+        """Recorre todas las series por lotes, cargando las temporadas de cada lote."""
+        batch_size = current_app.config["STREAM_YIELD_PER"]
+        stmt = (
+            self._filtered(select(*Series.public_columns()), filters)
+            .order_by(Series.__table__.c.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for batch in db.session.execute(stmt).mappings().partitions(batch_size):
+            yield from self._with_seasons(batch)
+
+    def _page_query(self, columns, limit, after, filters, sort):
+        c = Series.__table__.c
+        sortable = {"id": c.id, "title": c.title, "updated_at": c.updated_at}
+        order, descending, scope = parse_sort(sort, sortable, c.id)
+        # Las columnas del cursor tienen que estar en el SELECT.
+        columns = list(columns) + [col for col in order if not any(col is existing for existing in columns)]
+        stmt = apply_keyset(self._filtered(select(*columns), filters), order, after, limit, descending, scope)
+        return stmt, scope, order
+
+    @staticmethod
+    def _filtered(stmt, filters: dict | None):
+        """Filtra por genero con la tabla puente (busqueda por indice, sin LIKE).
+
+        `genre=drama,crimen` devuelve las series que tienen alguno de los generos.
+        """
+        filters = filters or {}
+        names = Genre.parse(filters.get("genre"))
+        if names:
+            genres = Genre.__table__.c
+            stmt = stmt.where(
+                Series.__table__.c.id.in_(
+                    select(series_genres.c.series_id)
+                    .join(Genre.__table__, genres.id == series_genres.c.genre_id)
+                    .where(genres.name.in_(names))
+                )
+            )
+        return stmt
+
+    def _with_seasons(self, rows) -> list[dict]:
+        """Convierte filas de series en dicts y les agrega sus temporadas."""
+        data = [dict(row, seasons=[]) for row in rows]
+        if not data:
+            return data
+        by_id = {item["id"]: item for item in data}
+        season_cols = Season.__table__.c
+        seasons = db.session.execute(
+            select(*Season.public_columns())
+            .where(season_cols.series_id.in_(by_id))
+            .order_by(season_cols.series_id, season_cols.number)
+        ).mappings()
+        for season in seasons:
+            by_id[season["series_id"]]["seasons"].append(dict(season))
+        return data
 
     def create_series(self, payload: dict) -> dict:
         if not payload.get("title"):
@@ -24,26 +144,36 @@ class SeriesService:
             genres=payload.get("genres"),
             total_seasons=payload.get("total_seasons", 0),
         )
+        series.genre_tags = Genre.resolve(Genre.parse(series.genres))
         db.session.add(series)
         db.session.commit()
+        # SQLite puede reutilizar el id de una serie borrada.
+        cache.delete(series_cache_key(series.id))
         return series.to_dict()
 
     def get_series(self, series_id: int) -> dict:
-        series = Series.query.get(series_id)
+        return cache.get_or_set(series_cache_key(series_id), lambda: self._load_series(series_id))
+
+    def _load_series(self, series_id: int) -> dict:
+        series = db.session.get(Series, series_id, options=[selectinload(Series.seasons)])
         if not series:
             raise LookupError("Serie no encontrada")
-        return series.to_dict(include_seasons=True)
+        # Se cachea ya serializada: los aciertos no vuelven a codificar JSON.
+        return pre_encode(series.to_dict(include_seasons=True))
 
     def update_series(self, series_id: int, payload: dict) -> dict:
-        series = Series.query.get(series_id)
+        series = db.session.get(Series, series_id, options=[selectinload(Series.seasons)])
         if not series:
             raise LookupError("Serie no encontrada")
 
         series.title = payload.get("title", series.title)
         series.synopsis = payload.get("synopsis", series.synopsis)
-        series.genres = payload.get("genres", series.genres)
+        if "genres" in payload:
+            series.genres = payload["genres"]
+            series.genre_tags = Genre.resolve(Genre.parse(series.genres))
         series.total_seasons = payload.get("total_seasons", series.total_seasons)
         db.session.commit()
+        cache.delete(series_cache_key(series_id))
         return series.to_dict(include_seasons=True)
 
     def delete_series(self, series_id: int) -> None:
@@ -52,31 +182,72 @@ class SeriesService:
             raise LookupError("Serie no encontrada")
         db.session.delete(series)
         db.session.commit()
+        cache.delete(series_cache_key(series_id))
 
     def add_season(self, series_id: int, payload: dict) -> dict:
+        """Crea o edita una temporada y actualiza el total de episodios de la serie."""
         series = Series.query.get(series_id)
         if not series:
             raise LookupError("Serie no encontrada")
 
         number = payload.get("number")
-        episodes = payload.get("episodes_count", 0)
+        episodes = payload.get("episodes_count", 0) or 0
         if not number:
             raise ValueError("El campo 'number' es obligatorio")
 
-        season = Season(series_id=series_id, number=number, episodes_count=episodes)
-        db.session.add(season)
+        season = Season.query.filter_by(series_id=series_id, number=number).first()
+        if season:
+            delta = episodes - (season.episodes_count or 0)
+            season.episodes_count = episodes
+        else:
+            delta = episodes
+            season = Season(series_id=series_id, number=number, episodes_count=episodes)
+            db.session.add(season)
+
+        if delta:
+            # Incremento en SQL para no pisar altas concurrentes de otras temporadas.
+            series.total_episodes = Series.total_episodes + delta
+            db.session.flush()
+            new_total = select(Series.total_episodes).where(Series.id == series_id).scalar_subquery()
+            # Refresca en un solo UPDATE las entradas que todavia se estan viendo.
+            db.session.execute(
+                update(WatchEntry)
+                .where(WatchEntry.series_id == series_id, WatchEntry.status != "completed")
+                .values(total_episodes=new_total)
+            )
         db.session.commit()
+        cache.delete(series_cache_key(series_id))
         return season.to_dict()
 
-
 service = SeriesService()
 
 
 @bp.get("/")
 def list_series():
+    if "ids" in request.args:
+        return batch_series()
+    filters = {"genre": request.args.get("genre")}
+    sort = request.args.get("sort")
+    if wants_stream():
+        return stream_ndjson(service.iter_series(filters))
     try:
-        data = service.list_series()
-        return jsonify(data), 200
+        limit, after = get_page_args()
+        last_modified, *version = service.page_version(limit, after, filters, sort)
+        return conditional_response(
+            ("series", limit, after, sorted(filters.items()), sort, last_modified, *version),
+            # Sin Last-Modified, como en /movies/: los borrados solo cambian el ETag.
+            None,
+            lambda: (jsonify(service.list_series(limit, after, filters, sort)), 200),
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@bp.post("/batch")
+def batch_series():
+    try:
+        ids, fields = get_batch_args(SERIES_FIELDS, MOVIE_ONLY_FIELDS)
+        return jsonify(service.get_many(ids, fields)), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
@@ -95,7 +266,12 @@ def create_series():
 def retrieve_series(series_id: int):
     try:
         data = service.get_series(series_id)
-        return jsonify(data), 200
+        # Una temporada nueva sin episodios no cambia updated_at de la serie.
+        return conditional_response(
+            ("series", data["id"], data["updated_at"], len(data["seasons"])),
+            data["updated_at"],
+            lambda: (jsonify(data), 200),
+        )
     except LookupError as e:
         return jsonify({"error": str(e)}), 404
 
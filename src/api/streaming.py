@@ -0,0 +1,28 @@
+"""Respuestas NDJSON en streaming para exportar listados grandes."""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def wants_stream() -> bool:
+    """Indica si el cliente pidio el listado completo en formato NDJSON."""
+    if request.args.get("format") == "ndjson":
+        return True
+    return request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+
+def stream_ndjson(rows: Iterable[dict]) -> Response:
+    """Serializa fila por fila; el primer byte sale antes de leer todo el resultado."""
+    dumps = current_app.json.dumps_bytes
+
+    def generate():
+        for row in rows:
+            yield dumps(row) + b"\n"
+
+    # stream_with_context mantiene viva la sesion mientras se consume el cursor.
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
@@ -0,0 +1,179 @@
+"""Cache de lecturas con backends intercambiables (LRU en proceso, Redis o nulo)."""
+
+from __future__ import annotations
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from flask import Flask, current_app
+
+_MISSING = object()
+
+
+class NullCache:
+    """Backend que no guarda nada; util para desactivar el cache."""
+
+    def get(self, key: str) -> Any:
+        return _MISSING
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        return None
+
+    def delete(self, *keys: str) -> None:
+        return None
+
+    def __len__(self) -> int:
+        return 0
+
+
+class LRUCache:
+    """Cache en memoria del proceso con expulsion LRU y vencimiento por TTL."""
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return _MISSING
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisCache:
+    """Backend compartido entre workers; acepta cualquier cliente compatible con redis-py."""
+
+    def __init__(self, client=None, url: str | None = None, prefix: str = "watchlog:") -> None:
+        if client is None:
+            try:
+                import redis
+            except ImportError as exc:  # pragma: no cover - dependencia opcional
+                raise RuntimeError("CACHE_TYPE='redis' requiere instalar el paquete 'redis'") from exc
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Any:
+        raw = self.client.get(self.prefix + key)
+        return _MISSING if raw is None else pickle.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=ttl)
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def __len__(self) -> int:
+        return self.client.dbsize()
+
+
+class Cache:
+    """Extension de Flask que expone el backend configurado y sus contadores.
+
+    `name` separa instancias con su propio backend y capacidad (la clave en
+    `app.extensions` y el prefijo en Redis); `max_entries_key` es la opcion de
+    config con el tamano del LRU.
+    """
+
+    def __init__(self, name: str = "cache", max_entries_key: str = "CACHE_MAX_ENTRIES") -> None:
+        self.name = name
+        self.max_entries_key = max_entries_key
+
+    def init_app(self, app: Flask, backend=None) -> None:
+        """Crea el backend segun `CACHE_TYPE`; `backend` permite inyectar un sustituto en tests."""
+        if backend is None:
+            cache_type = app.config.get("CACHE_TYPE", "simple")
+            if cache_type == "simple":
+                backend = LRUCache(app.config.get(self.max_entries_key, 10_000))
+            elif cache_type == "redis":
+                prefix = "watchlog:" if self.name == "cache" else f"watchlog:{self.name}:"
+                backend = RedisCache(url=app.config.get("CACHE_REDIS_URL"), prefix=prefix)
+            elif cache_type == "null":
+                backend = NullCache()
+            else:
+                raise ValueError(f"CACHE_TYPE desconocido: {cache_type}")
+        app.extensions[self.name] = _CacheState(backend, app.config.get("CACHE_DEFAULT_TTL", 300))
+
+    @property
+    def _state(self) -> "_CacheState":
+        return current_app.extensions[self.name]
+
+    def get_or_set(self, key: str, factory: Callable[[], Any], ttl: int | None = None) -> Any:
+        """Devuelve el valor cacheado o lo calcula con `factory` y lo guarda."""
+        state = self._state
+        value = state.backend.get(key)
+        if value is not _MISSING:
+            state.hits += 1
+            return value
+        state.misses += 1
+        value = factory()
+        state.backend.set(key, value, ttl or state.default_ttl)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Devuelve el valor cacheado o `default` si no existe o vencio."""
+        state = self._state
+        value = state.backend.get(key)
+        if value is _MISSING:
+            state.misses += 1
+            return default
+        state.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        """Guarda `value` con el TTL indicado (o el configurado por defecto)."""
+        state = self._state
+        state.backend.set(key, value, ttl or state.default_ttl)
+
+    def delete(self, *keys: str) -> None:
+        """Invalida las claves indicadas."""
+        self._state.backend.delete(*keys)
+
+    def stats(self) -> dict:
+        """Contadores para dimensionar el cache."""
+        state = self._state
+        return {
+            "backend": type(state.backend).__name__,
+            "hits": state.hits,
+            "misses": state.misses,
+            "size": len(state.backend),
+            "evictions": getattr(state.backend, "evictions", 0),
+        }
+
+
+class _CacheState:
+    """Backend y contadores asociados a una aplicacion."""
+
+    def __init__(self, backend, default_ttl: int) -> None:
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,172 @@
+"""Comandos `flask catalog`: exportar e importar el catalogo como NDJSON comprimido.
+
+Formato del snapshot (gzip, una linea JSON por registro): por cada tabla una
+cabecera `{"table": ..., "columns": [...]}` seguida de una fila por linea
+como lista de valores en ese orden. Las tablas van en orden de dependencias,
+asi que la importacion nunca viola una clave foranea.
+"""
+
+from __future__ import annotations
+
+import gzip
+import sys
+import time
+from datetime import datetime, timezone
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import DateTime, delete, func, insert, select, text
+
+from src.extensions import db, search
+
+catalog_cli = AppGroup("catalog", help="Exporta e importa snapshots del catalogo y las watchlists.")
+
+# Orden de carga: cada tabla solo referencia tablas anteriores. user_watch_stats
+# no se exporta; la mantienen los triggers de watch_entries.
+SNAPSHOT_TABLES = ("users", "movies", "series", "seasons", "genres", "series_genres", "watch_entries")
+
+
+def _tables() -> list:
+    return [db.metadata.tables[name] for name in SNAPSHOT_TABLES]
+
+
+def _open(path: str, mode: str):
+    """Abre el snapshot con gzip; `-` usa stdin/stdout."""
+    if path == "-":
+        stream = sys.stdout.buffer if mode == "wb" else sys.stdin.buffer
+        return gzip.GzipFile(fileobj=stream, mode=mode)
+    return gzip.open(path, mode)
+
+
+@catalog_cli.command("export")
+@click.argument("path")
+def export_catalog(path: str) -> None:
+    """Escribe el snapshot en PATH (`-` para stdout) leyendo cada tabla con un cursor."""
+    dumps = current_app.json.dumps_bytes
+    batch_size = current_app.config["STREAM_YIELD_PER"]
+    started = time.perf_counter()
+    with _open(path, "wb") as output:
+        for table in _tables():
+            columns = list(table.c)
+            output.write(dumps({"table": table.name, "columns": [c.name for c in columns]}) + b"\n")
+            stmt = (
+                select(*columns)
+                .order_by(*table.primary_key.columns)
+                .execution_options(yield_per=batch_size)
+            )
+            count = 0
+            for partition in db.session.execute(stmt).partitions():
+                output.write(b"".join(dumps(list(row)) + b"\n" for row in partition))
+                count += len(partition)
+            click.echo(f"{table.name}: {count} filas", err=True)
+    click.echo(f"Snapshot exportado en {time.perf_counter() - started:.1f}s", err=True)
+
+
+@catalog_cli.command("import")
+@click.argument("path")
+@click.option("--batch-size", default=10_000, show_default=True, help="Filas por executemany.")
+@click.option("--replace", is_flag=True, help="Borra los datos actuales antes de cargar.")
+def import_catalog(path: str, batch_size: int, replace: bool) -> None:
+    """Carga un snapshot de PATH (`-` para stdin) en una sola transaccion."""
+    tables = {table.name: table for table in _tables()}
+    started = time.perf_counter()
+    try:
+        _prepare(tables, replace)
+        with _open(path, "rb") as source:
+            for name, count in _load(source, tables, batch_size):
+                click.echo(f"{name}: {count} filas", err=True)
+        _finish(tables)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    click.echo(f"Snapshot importado en {time.perf_counter() - started:.1f}s", err=True)
+
+
+def _prepare(tables: dict, replace: bool) -> None:
+    """Vacia las tablas (con `--replace`) o exige que esten vacias."""
+    session = db.session
+    if session.get_bind().dialect.name == "sqlite":
+        # Las claves foraneas se validan al hacer COMMIT y no fila por fila.
+        session.execute(text("PRAGMA defer_foreign_keys = ON"))
+    if replace:
+        for table in reversed(list(tables.values())):
+            session.execute(delete(table))
+        # Los triggers ya la vacian; se borra igual para no depender de ellos.
+        session.execute(delete(db.metadata.tables["user_watch_stats"]))
+        return
+    for table in tables.values():
+        if session.scalar(select(func.count()).select_from(table)):
+            raise click.ClickException(f"La tabla '{table.name}' no esta vacia (usar --replace)")
+
+
+def _load(source, tables: dict, batch_size: int):
+    """Lee el snapshot linea por linea e inserta por lotes; produce (tabla, filas)."""
+    loads = current_app.json.loads
+    table = None
+    names: list[str] = []
+    parsers: list = []
+    rows: list[dict] = []
+    count = 0
+    for line in source:
+        record = loads(line)
+        if isinstance(record, dict):
+            if table is not None:
+                _insert(table, rows)
+                yield table.name, count
+            table = tables.get(record.get("table"))
+            if table is None:
+                raise click.ClickException(f"Tabla desconocida en el snapshot: {record.get('table')}")
+            names = record["columns"]
+            unknown = [name for name in names if name not in table.c]
+            if unknown:
+                raise click.ClickException(f"Columnas desconocidas en {table.name}: {', '.join(unknown)}")
+            parsers = [_parse_datetime if isinstance(table.c[name].type, DateTime) else None for name in names]
+            rows, count = [], 0
+            continue
+        if table is None:
+            raise click.ClickException("Snapshot invalido: faltan las cabeceras de tabla")
+        rows.append(
+            {
+                name: parse(value) if parse and value is not None else value
+                for name, parse, value in zip(names, parsers, record)
+            }
+        )
+        count += 1
+        if len(rows) >= batch_size:
+            _insert(table, rows)
+            rows = []
+    if table is not None:
+        _insert(table, rows)
+        yield table.name, count
+
+
+def _insert(table, rows: list[dict]) -> None:
+    # executemany: una sola sentencia preparada para todo el lote (sin RETURNING).
+    if rows:
+        db.session.execute(insert(table), rows)
+
+
+def _parse_datetime(value: str) -> datetime:
+    """Las fechas se exportan con zona (`+00:00`) y se guardan en UTC sin zona."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _finish(tables: dict) -> None:
+    """Tareas que las inserciones con Core no hacen solas."""
+    # El indice de busqueda solo se actualiza con los eventos ORM.
+    search.rebuild()
+    if db.session.get_bind().dialect.name == "postgresql":
+        # Los ids llegan explicitos: las secuencias deben continuar desde el maximo.
+        for table in tables.values():
+            if "id" in table.c and table.c.id.primary_key:
+                db.session.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                        f"COALESCE((SELECT MAX(id) FROM {table.name}), 0) + 1, false)"
+                    )
+                )
@@ -10,6 +10,27 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 INSTANCE_PATH = BASE_DIR / "instance"
 
 
+def engine_options(url: str, pool_size: int = 5, max_overflow: int = 10) -> dict:
+    """Opciones del pool de conexiones leidas del entorno (`DB_POOL_*`).
+
+    SQLite en memoria usa un unico `StaticPool` y no admite tamano de pool.
+    """
+    if url.startswith("sqlite") and (":memory:" in url or url.rstrip("/") == "sqlite:"):
+        return {}
+    options = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", str(pool_size))),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", str(max_overflow))),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        # Recicla antes de que el servidor o un proxy cierre conexiones inactivas.
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") == "1",
+    }
+    statement_timeout = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    if statement_timeout and url.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout}"}
+    return options
+
+
 class BaseConfig:
     """Config comun a cualquier entorno."""
 
@@ -18,8 +39,53 @@ class BaseConfig:
         "DATABASE_URL",
         f"sqlite:///{INSTANCE_PATH / 'app.db'}",
     )
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JSON_SORT_KEYS = False
+    PAGINATION_DEFAULT_LIMIT = int(os.getenv("PAGINATION_DEFAULT_LIMIT", "50"))
+    PAGINATION_MAX_LIMIT = int(os.getenv("PAGINATION_MAX_LIMIT", "200"))
+    CACHE_TYPE = os.getenv("CACHE_TYPE", "simple")
+    CACHE_DEFAULT_TTL = int(os.getenv("CACHE_DEFAULT_TTL", "300"))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    # auto: FTS5 en SQLite, tsvector + GIN en Postgres, indice en memoria en otro caso.
+    SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto")
+    # Indice en memoria: cada cuanto compara la version del catalogo para ver
+    # escrituras de otros workers o cargas con Core (0 = en cada busqueda).
+    SEARCH_MEMORY_CHECK_SECONDS = float(os.getenv("SEARCH_MEMORY_CHECK_SECONDS", "5"))
+    # Maximo de ids por peticion en GET ?ids= y POST /batch de peliculas y series.
+    BATCH_MAX_IDS = int(os.getenv("BATCH_MAX_IDS", "100"))
+    STREAM_YIELD_PER = int(os.getenv("STREAM_YIELD_PER", "1000"))
+    WATCHLIST_BULK_MAX_ITEMS = int(os.getenv("WATCHLIST_BULK_MAX_ITEMS", "1000"))
+    # GET /me/continue-watching: cantidad de entradas y vigencia del cache por usuario
+    # (el avance lo invalida; las ediciones del catalogo esperan al TTL).
+    CONTINUE_WATCHING_LIMIT = int(os.getenv("CONTINUE_WATCHING_LIMIT", "20"))
+    CONTINUE_WATCHING_TTL = int(os.getenv("CONTINUE_WATCHING_TTL", "60"))
+    # Capacidad del LRU propio de esos feeds (independiente de CACHE_MAX_ENTRIES).
+    CONTINUE_WATCHING_MAX_ENTRIES = int(os.getenv("CONTINUE_WATCHING_MAX_ENTRIES", "10000"))
+    # Tiempo durante el que se recuerda la respuesta de cada `Idempotency-Key`.
+    IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", "86400"))
+    # Capacidad del LRU propio de esas respuestas (independiente de CACHE_MAX_ENTRIES).
+    IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+    # /health/ready: ventana de cache del resultado y limite del SELECT 1.
+    HEALTH_CACHE_SECONDS = float(os.getenv("HEALTH_CACHE_SECONDS", "5"))
+    HEALTH_DB_TIMEOUT_MS = int(os.getenv("HEALTH_DB_TIMEOUT_MS", "1000"))
+    HEALTH_REQUIRE_MIGRATIONS = os.getenv("HEALTH_REQUIRE_MIGRATIONS", "1") == "1"
+    # PRAGMA aplicados a cada conexion SQLite (WAL y mmap no aplican en memoria).
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negativo = KiB
+    # Un unico escritor a la vez entre todos los workers (candado de archivo).
+    SQLITE_SERIALIZE_WRITES = os.getenv("SQLITE_SERIALIZE_WRITES", "0") == "1"
+    SQLITE_WRITE_LOCK_TIMEOUT_MS = int(os.getenv("SQLITE_WRITE_LOCK_TIMEOUT_MS", "30000"))
+    # Instrumentacion opcional: latencias, consultas por peticion y GET /metrics.
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "0") == "1"
+    METRICS_SLOW_QUERY_MS = float(os.getenv("METRICS_SLOW_QUERY_MS", "200"))
+    # /me/stats lee user_watch_stats (mantenida por triggers en SQLite/Postgres);
+    # si se desactiva agrega watch_entries en vivo.
+    WATCHLIST_STATS_MATERIALIZED = os.getenv("WATCHLIST_STATS_MATERIALIZED", "1") == "1"
 
 
 class DevelopmentConfig(BaseConfig):
@@ -33,6 +99,9 @@ class TestingConfig(BaseConfig):
 
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    # Las pruebas crean el esquema con create_all, sin tabla alembic_version.
+    HEALTH_REQUIRE_MIGRATIONS = False
 
 
 class ProductionConfig(BaseConfig):
@@ -40,3 +109,6 @@ class ProductionConfig(BaseConfig):
 
     DEBUG = False
     TESTING = False
+    # Cada worker de gunicorn tiene su pool: workers * (pool_size + max_overflow)
+    # debe quedar por debajo del limite de conexiones de Postgres.
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(BaseConfig.SQLALCHEMY_DATABASE_URI, max_overflow=5)
@@ -3,5 +3,17 @@
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
+from .cache import Cache
+from .metrics import Metrics
+from .search import SearchIndex
+
 db = SQLAlchemy()
 migrate = Migrate()
+cache = Cache()
+# Respuestas de Idempotency-Key: backend propio para no ocupar el LRU del catalogo
+# ni mezclarse con sus contadores de aciertos.
+idempotency_store = Cache("idempotency", "IDEMPOTENCY_MAX_ENTRIES")
+# Feeds "seguir viendo" por usuario: tampoco compiten con el catalogo por el LRU.
+continue_watching_store = Cache("continue_watching", "CONTINUE_WATCHING_MAX_ENTRIES")
+metrics = Metrics()
+search = SearchIndex()
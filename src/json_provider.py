@@ -0,0 +1,101 @@
+"""Proveedor JSON de la app: orjson si esta instalado, si no la libreria estandar.
+
+Las fechas salen en ISO-8601; las columnas se guardan en UTC sin zona, asi que
+las fechas sin zona se marcan como `+00:00`.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, timezone
+from typing import Any
+
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+# Argumentos de json.dumps que orjson puede reproducir; con otros se usa la libreria estandar.
+_ORJSON_KWARGS = {"default", "indent", "separators", "sort_keys"}
+
+
+class PreEncoded(dict):
+    """dict que ademas guarda su serializacion; `jsonify` envia esos bytes sin volver a codificar."""
+
+    def __init__(self, data: dict, encoded: bytes) -> None:
+        super().__init__(data)
+        self.encoded = encoded
+
+
+def pre_encode(data: dict) -> PreEncoded:
+    """Serializa `data` una vez (por ejemplo antes de guardarlo en el cache)."""
+    return PreEncoded(data, current_app.json.dumps_bytes(data))
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Codifica directo a bytes y respeta `JSON_SORT_KEYS` de la config."""
+
+    default = staticmethod(_default)
+
+    def __init__(self, app) -> None:
+        super().__init__(app)
+        self.sort_keys = app.config.get("JSON_SORT_KEYS", True)
+
+    def dumps_bytes(self, obj: Any, **kwargs: Any) -> bytes:
+        """Serializa a bytes UTF-8 sin pasar por un `str` intermedio cuando hay orjson."""
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        if orjson is None or not kwargs.keys() <= _ORJSON_KWARGS:
+            return self._dumps_stdlib(obj, **kwargs).encode()
+        option = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys"):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get("default", self.default), option=option)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self.dumps_bytes(obj, **kwargs).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        if isinstance(obj, PreEncoded):
+            body = obj.encoded
+        elif (self.compact is None and self._app.debug) or self.compact is False:
+            body = self.dumps_bytes(obj, indent=2)
+        else:
+            body = self.dumps_bytes(obj)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+    def _dumps_stdlib(self, obj: Any, **kwargs: Any) -> str:
+        kwargs.setdefault("default", self.default)
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        if not kwargs.get("indent"):
+            kwargs.setdefault("separators", (",", ":"))
+        return json.dumps(obj, **kwargs)
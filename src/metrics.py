@@ -0,0 +1,184 @@
+"""Instrumentacion opcional: latencia por endpoint, consultas SQL por peticion y /metrics.
+
+Se activa con `METRICS_ENABLED=1`. Los valores son por proceso; con varios
+workers de gunicorn Prometheus debe agregar las series de cada uno.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from collections import defaultdict
+
+from flask import Flask, Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Histograma acumulativo con los buckets fijos de Prometheus."""
+
+    def __init__(self, buckets: tuple) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+
+    def lines(self, name: str, labels: str) -> list[str]:
+        prefix = f"{labels}," if labels else ""
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {self.total}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {self.total}")
+        return lines
+
+
+class _Registry:
+    """Series acumuladas de una aplicacion."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.requests: dict[tuple, int] = defaultdict(int)
+        self.latency: dict[tuple, Histogram] = {}
+        self.queries: dict[tuple, Histogram] = {}
+        self.query_seconds: dict[tuple, float] = defaultdict(float)
+        self.slow_queries: dict[tuple, int] = defaultdict(int)
+
+
+class Metrics:
+    """Extension de Flask que mide peticiones y sentencias SQL."""
+
+    def init_app(self, app: Flask) -> None:
+        if not app.config.get("METRICS_ENABLED"):
+            return
+        from src.extensions import db
+
+        app.extensions["metrics"] = _Registry()
+        with app.app_context():
+            engine = db.engine
+        if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        app.before_request(_start_request)
+        app.after_request(_finish_request)
+        app.add_url_rule("/metrics", "metrics", _metrics_view, methods=["GET"])
+
+
+def _endpoint() -> str:
+    # Se usa la regla (`/movies/<int:movie_id>`) y no la URL para acotar las series.
+    return request.url_rule.rule if request.url_rule else "<unmatched>"
+
+
+def _start_request() -> None:
+    g.metrics_start = time.perf_counter()
+    g.metrics_queries = 0
+    g.metrics_query_seconds = 0.0
+
+
+def _finish_request(response: Response) -> Response:
+    start = g.pop("metrics_start", None)
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+    key = (request.method, _endpoint())
+    registry = current_app.extensions["metrics"]
+    with registry.lock:
+        registry.requests[(*key, response.status_code)] += 1
+        registry.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(elapsed)
+        registry.queries.setdefault(key, Histogram(QUERY_COUNT_BUCKETS)).observe(g.metrics_queries)
+        registry.query_seconds[key] += g.metrics_query_seconds
+    return response
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get("metrics_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    if not has_request_context() or "metrics_start" not in g:
+        return
+    g.metrics_queries += 1
+    g.metrics_query_seconds += elapsed
+    if elapsed * 1000 >= current_app.config["METRICS_SLOW_QUERY_MS"]:
+        key = (request.method, _endpoint())
+        registry = current_app.extensions["metrics"]
+        with registry.lock:
+            registry.slow_queries[key] += 1
+        current_app.logger.warning(
+            "Consulta lenta (%.1f ms) en %s %s: %s",
+            elapsed * 1000,
+            key[0],
+            key[1],
+            " ".join(statement.split()),
+        )
+
+
+def _header(name: str, kind: str, help_text: str) -> list[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+
+def _labels(**values) -> str:
+    return ",".join(f'{name}="{str(value).replace(chr(34), chr(39))}"' for name, value in values.items())
+
+
+def _metrics_view() -> Response:
+    """Exposicion en formato de texto de Prometheus."""
+    from src.extensions import cache, db
+    from src.pool import pool_stats
+
+    registry = current_app.extensions["metrics"]
+    lines: list[str] = []
+    with registry.lock:
+        lines += _header("http_requests_total", "counter", "Peticiones atendidas.")
+        for (method, endpoint, status), count in sorted(registry.requests.items()):
+            labels = _labels(method=method, endpoint=endpoint, status=status)
+            lines.append(f"http_requests_total{{{labels}}} {count}")
+
+        lines += _header("http_request_duration_seconds", "histogram", "Latencia por endpoint.")
+        for (method, endpoint), histogram in sorted(registry.latency.items()):
+            labels = _labels(method=method, endpoint=endpoint)
+            lines += histogram.lines("http_request_duration_seconds", labels)
+
+        lines += _header("db_queries_per_request", "histogram", "Sentencias SQL por peticion.")
+        for (method, endpoint), histogram in sorted(registry.queries.items()):
+            labels = _labels(method=method, endpoint=endpoint)
+            lines += histogram.lines("db_queries_per_request", labels)
+
+        lines += _header("db_query_seconds_total", "counter", "Tiempo total en SQL.")
+        for (method, endpoint), seconds in sorted(registry.query_seconds.items()):
+            labels = _labels(method=method, endpoint=endpoint)
+            lines.append(f"db_query_seconds_total{{{labels}}} {seconds:.6f}")
+
+        lines += _header("db_slow_queries_total", "counter", "Consultas sobre METRICS_SLOW_QUERY_MS.")
+        for (method, endpoint), count in sorted(registry.slow_queries.items()):
+            labels = _labels(method=method, endpoint=endpoint)
+            lines.append(f"db_slow_queries_total{{{labels}}} {count}")
+
+    cache_stats = cache.stats()
+    for name in ("hits", "misses", "evictions"):
+        lines += [f"# TYPE cache_{name}_total counter", f"cache_{name}_total {cache_stats[name]}"]
+    lines += ["# TYPE cache_entries gauge", f"cache_entries {cache_stats['size']}"]
+
+    for name, value in pool_stats(db.engine).items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            kind = "counter" if name in ("checkouts", "timeouts", "wait_seconds_total") else "gauge"
+            lines += [f"# TYPE db_pool_{name} {kind}", f"db_pool_{name} {value}"]
+
+    return Response("\n".join(lines) + "\n", content_type="text/plain; version=0.0.4; charset=utf-8")
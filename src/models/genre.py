@@ -0,0 +1,47 @@
+"""Modelo de generos normalizados para las series."""
+
+from __future__ import annotations
+
+from sqlalchemy import select
+
+from src.extensions import db
+from src.sql import dialect_insert
+
+# Tabla puente series <-> generos; el indice (genre_id, series_id) resuelve los filtros.
+series_genres = db.Table(
+    "series_genres",
+    db.Column("series_id", db.Integer, db.ForeignKey("series.id"), primary_key=True),
+    db.Column("genre_id", db.Integer, db.ForeignKey("genres.id"), primary_key=True),
+    db.Index("ix_series_genres_genre", "genre_id", "series_id"),
+)
+
+
+class Genre(db.Model):
+    """Genero unico (en minusculas) derivado del texto libre `Series.genres`."""
+
+    __tablename__ = "genres"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False, unique=True)
+
+    @staticmethod
+    def parse(value: str | None) -> list[str]:
+        """Separa "Drama, Crimen" en nombres normalizados sin repetidos."""
+        if not value:
+            return []
+        names = (part.strip().lower() for part in value.split(","))
+        return list(dict.fromkeys(name for name in names if name))
+
+    @classmethod
+    def resolve(cls, names: list[str]) -> list["Genre"]:
+        """Devuelve los generos pedidos creando los que falten (seguro ante altas concurrentes)."""
+        if not names:
+            return []
+        stmt = dialect_insert(cls.__table__).on_conflict_do_nothing(index_elements=["name"])
+        db.session.execute(stmt, [{"name": name} for name in names])
+        genres = db.session.scalars(select(cls).where(cls.name.in_(names))).all()
+        by_name = {genre.name: genre for genre in genres}
+        return [by_name[name] for name in names]
+
+    def __repr__(self) -> str:
+        return f"<Genre id={self.id} name={self.name}>"
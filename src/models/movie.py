@@ -19,6 +19,19 @@ class Movie(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Indices para los filtros (genero sin distinguir mayusculas, anio) y los
+    # ordenamientos keyset (campo, id) de GET /movies/. Los (genero, campo, id)
+    # sirven el filtro por genero ya ordenado, sin ordenar todo el genero.
+    __table_args__ = (
+        db.Index("ix_movies_genre_lower", db.func.lower(genre)),
+        db.Index("ix_movies_genre_release_year_id", db.func.lower(genre), "release_year", "id"),
+        db.Index("ix_movies_genre_title_id", db.func.lower(genre), "title", "id"),
+        db.Index("ix_movies_genre_updated_at_id", db.func.lower(genre), "updated_at", "id"),
+        db.Index("ix_movies_release_year_id", "release_year", "id"),
+        db.Index("ix_movies_title_id", "title", "id"),
+        db.Index("ix_movies_updated_at_id", "updated_at", "id"),
+    )
+
     # Relacion con WatchEntry (one-to-many)
     watch_entries = db.relationship("WatchEntry", back_populates="movie", lazy=True)
 
@@ -27,6 +40,12 @@ class Movie(db.Model):
         # TODO: ajustar los campos utilizados en la representacion.
         return f"<Movie id={self.id} title={self.title}>"
 
+    @classmethod
+    def public_columns(cls) -> list:
+        """Columnas que expone `to_dict`, para lecturas con SQLAlchemy Core."""
+        c = cls.__table__.c
+        return [c.id, c.title, c.genre, c.release_year, c.created_at, c.updated_at]
+
     def to_dict(self) -> dict:
         """Serializa la instancia para respuestas JSON."""
         # TODO: reemplazar esta implementacion temporal por serializacion real.
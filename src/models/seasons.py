@@ -21,6 +21,11 @@ class Season(db.Model):
     # Relacion back_populates con Series
     series = db.relationship("Series", back_populates="seasons")
 
+    @classmethod
+    def public_columns(cls) -> list:
+        """Columnas que expone `to_dict`, para lecturas con SQLAlchemy Core."""
+        c = cls.__table__.c
+        return [c.id, c.series_id, c.number, c.episodes_count]
 
     def to_dict(self) -> dict:
         """Serializa la temporada en un diccionario."""
@@ -18,11 +18,21 @@ class Series(db.Model):
     genres = db.Column(db.String(100))
     image_url = db.Column(db.String(250))
     total_seasons = db.Column(db.Integer, default=0)
+    # Suma de episodes_count de sus temporadas, mantenida por SeriesService.add_season.
+    total_episodes = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Indices para los ordenamientos keyset (campo, id) de GET /series/.
+    __table_args__ = (
+        db.Index("ix_series_title_id", "title", "id"),
+        db.Index("ix_series_updated_at_id", "updated_at", "id"),
+    )
+
+    # Generos normalizados a partir de `genres` (texto libre separado por comas).
+    genre_tags = db.relationship("Genre", secondary="series_genres", lazy=True)
     # Relacion con Season (one-to-many)
-    seasons = db.relationship("Season", back_populates="series", lazy=True)
+    seasons = db.relationship("Season", back_populates="series", lazy=True, order_by="Season.number")
     # Relacion con WatchEntry
     watch_entries = db.relationship("WatchEntry", back_populates="series", lazy=True)
 
@@ -30,6 +40,22 @@ class Series(db.Model):
         """Devuelve una representacion legible del modelo."""
         return f"<Series id={self.id} title={self.title}>"
 
+    @classmethod
+    def public_columns(cls) -> list:
+        """Columnas que expone `to_dict`, para lecturas con SQLAlchemy Core."""
+        c = cls.__table__.c
+        return [
+            c.id,
+            c.title,
+            c.synopsis,
+            c.genres,
+            c.image_url,
+            c.total_seasons,
+            c.total_episodes,
+            c.created_at,
+            c.updated_at,
+        ]
+
     def to_dict(self, include_seasons: bool = False) -> dict:
         """Serializa la serie y opcionalmente sus temporadas."""
         # TODO: reemplazar por serializacion real usando marshmallow o similar.
@@ -40,6 +66,7 @@ class Series(db.Model):
             "genres": self.genres,
             "image_url": self.image_url,
             "total_seasons": self.total_seasons,
+            "total_episodes": self.total_episodes,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
         }
@@ -0,0 +1,84 @@
+"""Resumen materializado de la watchlist de cada usuario."""
+
+from __future__ import annotations
+
+from sqlalchemy import DDL, delete, event, func, insert, select
+
+from src.extensions import db
+
+from .watch_entry import WatchEntry
+
+
+class UserWatchStats(db.Model):
+    """Contadores por (usuario, estado) mantenidos por triggers sobre watch_entries."""
+
+    __tablename__ = "user_watch_stats"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    entries = db.Column(db.Integer, nullable=False, default=0)
+    watched_episodes = db.Column(db.Integer, nullable=False, default=0)
+    total_episodes = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def rebuild(cls) -> None:
+        """Recalcula toda la tabla desde watch_entries (por ejemplo si hubo triggers desactivados)."""
+        we = WatchEntry.__table__.c
+        db.session.execute(delete(cls.__table__))
+        db.session.execute(
+            insert(cls.__table__).from_select(
+                ["user_id", "status", "entries", "watched_episodes", "total_episodes"],
+                select(
+                    we.user_id,
+                    func.coalesce(we.status, "in_progress"),
+                    func.count(),
+                    func.sum(func.coalesce(we.watched_episodes, 0)),
+                    func.sum(func.coalesce(we.total_episodes, 0)),
+                ).group_by(we.user_id, func.coalesce(we.status, "in_progress")),
+            )
+        )
+
+
+# Los triggers ven OLD y NEW, asi que cualquier escritura (ORM, Core, UPDATE
+# atomico con RETURNING o carga masiva) aplica su delta sin pasos extra en Python.
+_ADD_NEW = (
+    "INSERT INTO user_watch_stats (user_id, status, entries, watched_episodes, total_episodes) "
+    "VALUES (NEW.user_id, COALESCE(NEW.status, 'in_progress'), 1, "
+    "COALESCE(NEW.watched_episodes, 0), COALESCE(NEW.total_episodes, 0)) "
+    "ON CONFLICT (user_id, status) DO UPDATE SET "
+    "entries = user_watch_stats.entries + 1, "
+    "watched_episodes = user_watch_stats.watched_episodes + excluded.watched_episodes, "
+    "total_episodes = user_watch_stats.total_episodes + excluded.total_episodes;"
+)
+_REMOVE_OLD = (
+    "UPDATE user_watch_stats SET entries = entries - 1, "
+    "watched_episodes = watched_episodes - COALESCE(OLD.watched_episodes, 0), "
+    "total_episodes = total_episodes - COALESCE(OLD.total_episodes, 0) "
+    "WHERE user_id = OLD.user_id AND status = COALESCE(OLD.status, 'in_progress');"
+)
+
+STATS_TRIGGERS = {
+    "sqlite": [
+        "CREATE TRIGGER IF NOT EXISTS trg_watch_entries_stats_insert AFTER INSERT ON watch_entries "
+        f"BEGIN {_ADD_NEW} END",
+        "CREATE TRIGGER IF NOT EXISTS trg_watch_entries_stats_delete AFTER DELETE ON watch_entries "
+        f"BEGIN {_REMOVE_OLD} END",
+        "CREATE TRIGGER IF NOT EXISTS trg_watch_entries_stats_update "
+        "AFTER UPDATE OF user_id, status, watched_episodes, total_episodes ON watch_entries "
+        f"BEGIN {_REMOVE_OLD} {_ADD_NEW} END",
+    ],
+    "postgresql": [
+        "CREATE OR REPLACE FUNCTION watch_entries_stats() RETURNS trigger AS $$ BEGIN "
+        f"IF TG_OP IN ('UPDATE', 'DELETE') THEN {_REMOVE_OLD} END IF; "
+        f"IF TG_OP IN ('UPDATE', 'INSERT') THEN {_ADD_NEW} END IF; "
+        "RETURN NULL; END; $$ LANGUAGE plpgsql",
+        "CREATE TRIGGER trg_watch_entries_stats "
+        "AFTER INSERT OR DELETE OR UPDATE OF user_id, status, watched_episodes, total_episodes "
+        "ON watch_entries FOR EACH ROW EXECUTE FUNCTION watch_entries_stats()",
+    ],
+}
+
+for _dialect, _statements in STATS_TRIGGERS.items():
+    for _statement in _statements:
+        # Tambien se crean con db.create_all() (tests y benchmarks sin migraciones).
+        event.listen(UserWatchStats.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
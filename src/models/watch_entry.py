@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from datetime import datetime
 
+from sqlalchemy import Float, case, cast, func
+
 from src.extensions import db
 
 
@@ -23,6 +25,40 @@ class WatchEntry(db.Model):
     total_episodes = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Ultima accion del usuario (alta, avance); a diferencia de updated_at no cambia
+    # cuando el catalogo refresca la entrada (p. ej. total_episodes en add_season).
+    last_activity_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Indices compuestos por usuario y unicidad parcial: un usuario no puede
+    # repetir la misma pelicula o serie en su watchlist.
+    __table_args__ = (
+        db.Index("ix_watch_entries_user_updated", "user_id", "updated_at"),
+        # "Seguir viendo": entradas en curso del usuario, las de actividad mas reciente
+        # primero; incluye id para que el desempate del ORDER BY tampoco ordene aparte.
+        db.Index(
+            "ix_watch_entries_user_status_activity",
+            user_id,
+            status,
+            last_activity_at.desc(),
+            id.desc(),
+        ),
+        db.Index(
+            "uq_watch_entries_user_series",
+            "user_id",
+            "series_id",
+            unique=True,
+            sqlite_where=db.text("series_id IS NOT NULL"),
+            postgresql_where=db.text("series_id IS NOT NULL"),
+        ),
+        db.Index(
+            "uq_watch_entries_user_movie",
+            "user_id",
+            "movie_id",
+            unique=True,
+            sqlite_where=db.text("movie_id IS NOT NULL"),
+            postgresql_where=db.text("movie_id IS NOT NULL"),
+        ),
+    )
 
     # Relaciones
     user = db.relationship("User", back_populates="watch_entries")
@@ -36,11 +72,41 @@ class WatchEntry(db.Model):
         percentage = (self.watched_episodes / self.total_episodes) * 100
         return min(percentage, 100.0)
 
+    @classmethod
+    def percentage_watched_expr(cls):
+        """Equivalente SQL de `percentage_watched` para calcularlo en la consulta."""
+        c = cls.__table__.c
+        percentage = cast(func.coalesce(c.watched_episodes, 0), Float) / c.total_episodes * 100
+        return case(
+            (func.coalesce(c.total_episodes, 0) == 0, 0.0),
+            (percentage > 100, 100.0),
+            else_=percentage,
+        ).label("percentage_watched")
+
+    @classmethod
+    def public_columns(cls) -> list:
+        """Columnas que expone `to_dict`, con el porcentaje resuelto en SQL."""
+        c = cls.__table__.c
+        return [
+            c.id,
+            c.user_id,
+            c.movie_id,
+            c.series_id,
+            c.status,
+            c.current_season,
+            c.current_episode,
+            c.watched_episodes,
+            c.total_episodes,
+            cls.percentage_watched_expr(),
+            c.created_at,
+            c.updated_at,
+        ]
+
     def mark_as_watched(self) -> None:
         """Marca el contenido como completado."""
         self.status = "completed"
         self.watched_episodes = self.total_episodes
-        self.updated_at = datetime.utcnow()
+        self.updated_at = self.last_activity_at = datetime.utcnow()
         db.session.commit()
 
     def to_dict(self) -> dict:
@@ -0,0 +1,92 @@
+"""Pool de conexiones instrumentado y seguro ante el fork de los workers."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import weakref
+
+from flask import Flask
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from src.extensions import db
+
+_APPS: "weakref.WeakSet[Flask]" = weakref.WeakSet()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que mide cuanto espera cada checkout por una conexion libre."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_seconds += elapsed
+                self.max_wait_seconds = max(self.max_wait_seconds, elapsed)
+
+
+def pool_stats(engine) -> dict:
+    """Gauges del pool: conexiones en uso, overflow y espera de checkout."""
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(
+            checkouts=pool.checkouts,
+            timeouts=pool.timeouts,
+            wait_seconds_total=round(pool.wait_seconds, 6),
+            wait_seconds_max=round(pool.max_wait_seconds, 6),
+            wait_seconds_avg=round(pool.wait_seconds / pool.checkouts, 6) if pool.checkouts else 0.0,
+        )
+    return stats
+
+
+def init_pool(app: Flask) -> None:
+    """Usa el pool instrumentado y registra la app para rehacer sus pools tras un fork.
+
+    Se llama antes de `db.init_app`, que es quien crea el engine.
+    """
+    options = app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {}
+    if "pool_size" in options and "poolclass" not in options:
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {**options, "poolclass": InstrumentedQueuePool}
+    _APPS.add(app)
+
+
+def _reset_pools_after_fork() -> None:
+    # El hijo no debe reutilizar los sockets del padre: se descartan sin cerrarlos
+    # (close=False) para no cortar las conexiones que el padre sigue usando.
+    for app in list(_APPS):
+        if "sqlalchemy" not in app.extensions:
+            continue
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
@@ -0,0 +1,360 @@
+"""Busqueda de texto completo sobre el catalogo (peliculas y series).
+
+Backends segun la base configurada:
+- SQLite: tabla virtual FTS5 `search_index`, sincronizada con eventos de los modelos.
+- Postgres: columnas `search_vector` (tsvector generado) con indice GIN; se
+  mantienen solas y los eventos no hacen nada.
+- Cualquier otro caso: indice invertido en memoria del proceso, que se
+  reconstruye cuando cambia la version del catalogo en la base.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+
+from flask import Flask, current_app
+from sqlalchemy import event, func, inspect, select, text
+from sqlalchemy.orm import Session
+
+FIELD_WEIGHTS = {"title": 10.0, "genres": 3.0, "synopsis": 1.0}
+
+# Atributos de Movie/Series que alimentan el indice; otros cambios no lo tocan.
+INDEXED_ATTRIBUTES = ("title", "genre", "genres", "synopsis")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(value: str | None, strip_accents: bool = True) -> list[str]:
+    """Normaliza a minusculas (opcionalmente sin acentos) y separa en palabras."""
+    if not value:
+        return []
+    value = value.lower()
+    if strip_accents:
+        decomposed = unicodedata.normalize("NFKD", value)
+        value = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _TOKEN_RE.findall(value)
+
+
+def _session():
+    """Sesion de Flask-SQLAlchemy de la app actual (evita importar src.extensions)."""
+    return current_app.extensions["sqlalchemy"].session
+
+
+def _documents(target) -> tuple[str, dict]:
+    """Extrae (tipo, campos indexables) de una instancia Movie o Series."""
+    from src.models import Movie
+
+    if isinstance(target, Movie):
+        return "movie", {"title": target.title, "genres": target.genre, "synopsis": None}
+    return "series", {"title": target.title, "genres": target.genres, "synopsis": target.synopsis}
+
+
+def fts_rowid(kind: str, ref_id: int) -> int:
+    """Rowid FTS de un documento: id*2 para peliculas e id*2+1 para series.
+
+    Las columnas UNINDEXED de FTS5 no tienen indice; borrar por rowid evita
+    recorrer toda la tabla en cada escritura.
+    """
+    return ref_id * 2 + (kind == "series")
+
+
+class SQLiteFTSBackend:
+    """Indice FTS5 en la misma base; se escribe dentro de la transaccion del flush."""
+
+    def __init__(self) -> None:
+        self._ready = False
+
+    def ensure_schema(self, connection) -> None:
+        if not self._ready:
+            connection.exec_driver_sql(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+                "kind UNINDEXED, ref_id UNINDEXED, title, genres, synopsis, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+            self._ready = True
+
+    def upsert(self, connection, kind: str, ref_id: int, fields: dict) -> None:
+        self.delete(connection, kind, ref_id)
+        connection.execute(
+            text(
+                "INSERT INTO search_index (rowid, kind, ref_id, title, genres, synopsis) "
+                "VALUES (:rowid, :kind, :ref_id, :title, :genres, :synopsis)"
+            ),
+            {"rowid": fts_rowid(kind, ref_id), "kind": kind, "ref_id": ref_id, **fields},
+        )
+
+    def delete(self, connection, kind: str, ref_id: int) -> None:
+        self.ensure_schema(connection)
+        connection.execute(
+            text("DELETE FROM search_index WHERE rowid = :rowid"),
+            {"rowid": fts_rowid(kind, ref_id)},
+        )
+
+    def search(self, query: str, limit: int, offset: int) -> list[dict]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        connection = _session().connection()
+        self.ensure_schema(connection)
+        # Terminos entre comillas (sin sintaxis FTS del usuario); el ultimo admite prefijo.
+        match = " ".join(f'"{token}"' for token in tokens) + "*"
+        weights = ", ".join(str(FIELD_WEIGHTS[field]) for field in ("title", "genres", "synopsis"))
+        rows = connection.execute(
+            text(
+                f"SELECT kind, ref_id, title, -bm25(search_index, 0, 0, {weights}) AS score "
+                "FROM search_index WHERE search_index MATCH :match "
+                "ORDER BY score DESC, kind, ref_id LIMIT :limit OFFSET :offset"
+            ),
+            {"match": match, "limit": limit, "offset": offset},
+        )
+        return [_result(*row) for row in rows]
+
+    def rebuild(self) -> None:
+        connection = _session().connection()
+        self.ensure_schema(connection)
+        connection.exec_driver_sql("DELETE FROM search_index")
+        connection.exec_driver_sql(
+            "INSERT INTO search_index (rowid, kind, ref_id, title, genres, synopsis) "
+            "SELECT id * 2, 'movie', id, title, genre, NULL FROM movies "
+            "UNION ALL SELECT id * 2 + 1, 'series', id, title, genres, synopsis FROM series"
+        )
+
+
+class PostgresBackend:
+    """Consulta las columnas tsvector generadas; Postgres las mantiene al dia."""
+
+    def upsert(self, connection, kind: str, ref_id: int, fields: dict) -> None:
+        return None
+
+    def delete(self, connection, kind: str, ref_id: int) -> None:
+        return None
+
+    def search(self, query: str, limit: int, offset: int) -> list[dict]:
+        # La configuracion 'simple' de Postgres conserva los acentos.
+        tokens = tokenize(query, strip_accents=False)
+        if not tokens:
+            return []
+        rows = _session().execute(
+            text(
+                "SELECT kind, ref_id, title, score FROM ("
+                "  SELECT 'movie' AS kind, id AS ref_id, title, ts_rank(search_vector, q) AS score"
+                "  FROM movies, to_tsquery('simple', :query) q WHERE search_vector @@ q"
+                "  UNION ALL"
+                "  SELECT 'series', id, title, ts_rank(search_vector, q)"
+                "  FROM series, to_tsquery('simple', :query) q WHERE search_vector @@ q"
+                ") hits ORDER BY score DESC, kind, ref_id LIMIT :limit OFFSET :offset"
+            ),
+            {"query": " & ".join(tokens) + ":*", "limit": limit, "offset": offset},
+        )
+        return [_result(*row) for row in rows]
+
+    def rebuild(self) -> None:
+        return None
+
+
+class MemoryBackend:
+    """Indice invertido en memoria; se construye en la primera busqueda.
+
+    Los eventos solo avisan al proceso que hizo el cambio: las escrituras de
+    otros workers y las cargas con Core se detectan comparando la version del
+    catalogo (conteo, max(id) y max(updated_at)) cada
+    `SEARCH_MEMORY_CHECK_SECONDS`, y si cambio el indice se reconstruye.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._built = False
+        self._version: tuple | None = None
+        self._checked_at = 0.0
+        self._postings: dict[str, dict[tuple[str, int], float]] = defaultdict(dict)
+        self._vocabulary: list[str] = []
+        self._docs: dict[tuple[str, int], tuple[str, set[str]]] = {}
+
+    def upsert(self, connection, kind: str, ref_id: int, fields: dict) -> None:
+        # Se aplica en after_commit para no indexar cambios que luego se revierten.
+        _pending().append((self, kind, ref_id, fields))
+
+    def delete(self, connection, kind: str, ref_id: int) -> None:
+        _pending().append((self, kind, ref_id, None))
+
+    def apply(self, kind: str, ref_id: int, fields: dict | None) -> None:
+        with self._lock:
+            if self._built:
+                self._apply_locked(kind, ref_id, fields)
+
+    def _apply_locked(self, kind: str, ref_id: int, fields: dict | None) -> None:
+        key = (kind, ref_id)
+        previous = self._docs.pop(key, None)
+        if previous:
+            for token in previous[1]:
+                self._postings[token].pop(key, None)
+        if fields is None:
+            return
+        weights: dict[str, float] = defaultdict(float)
+        for field, value in fields.items():
+            for token in tokenize(value):
+                weights[token] += FIELD_WEIGHTS[field]
+        for token, weight in weights.items():
+            if token not in self._postings:
+                bisect.insort(self._vocabulary, token)
+            self._postings[token][key] = weight
+        self._docs[key] = (fields["title"], set(weights))
+
+    @staticmethod
+    def _catalog_version() -> tuple:
+        from src.models import Movie, Series
+
+        aggregates = []
+        for table in (Movie.__table__, Series.__table__):
+            aggregates += [
+                select(func.count()).select_from(table).scalar_subquery(),
+                select(func.max(table.c.id)).scalar_subquery(),
+                select(func.max(table.c.updated_at)).scalar_subquery(),
+            ]
+        return tuple(_session().execute(select(*aggregates)).one())
+
+    def _build(self) -> None:
+        from src.models import Movie, Series
+
+        # La version se toma antes de leer: un cambio durante la carga fuerza otra.
+        self._version = self._catalog_version()
+        self._checked_at = time.monotonic()
+        for model in (Movie, Series):
+            stmt = select(model).execution_options(yield_per=current_app.config["STREAM_YIELD_PER"])
+            for item in _session().scalars(stmt):
+                kind, fields = _documents(item)
+                self._apply_locked(kind, item.id, fields)
+        self._built = True
+
+    def search(self, query: str, limit: int, offset: int) -> list[dict]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self._lock:
+            interval = current_app.config["SEARCH_MEMORY_CHECK_SECONDS"]
+            if self._built and time.monotonic() - self._checked_at >= interval:
+                self._checked_at = time.monotonic()
+                if self._catalog_version() != self._version:
+                    self._reset_locked()
+            if not self._built:
+                self._build()
+            *exact, last = tokens
+            start = bisect.bisect_left(self._vocabulary, last)
+            prefixed = []
+            for token in self._vocabulary[start:]:
+                if not token.startswith(last):
+                    break
+                prefixed.append(token)
+
+            total_docs = len(self._docs) or 1
+            scores: dict[tuple[str, int], float] | None = None
+            for group in [[token] for token in exact] + [prefixed]:
+                group_scores: dict[tuple[str, int], float] = defaultdict(float)
+                for token in group:
+                    postings = self._postings.get(token, {})
+                    idf = math.log(1 + total_docs / (len(postings) or 1))
+                    for key, weight in postings.items():
+                        group_scores[key] += weight * idf
+                # Todas las palabras deben aparecer (AND).
+                if scores is None:
+                    scores = dict(group_scores)
+                else:
+                    scores = {key: scores[key] + group_scores[key] for key in scores if key in group_scores}
+            ranked = sorted((scores or {}).items(), key=lambda item: (-item[1], item[0]))
+            return [
+                _result(kind, ref_id, self._docs[(kind, ref_id)][0], score)
+                for (kind, ref_id), score in ranked[offset : offset + limit]
+            ]
+
+    def rebuild(self) -> None:
+        with self._lock:
+            self._reset_locked()
+
+    def _reset_locked(self) -> None:
+        self._postings.clear()
+        self._vocabulary.clear()
+        self._docs.clear()
+        self._built = False
+
+
+def _result(kind: str, ref_id: int, title: str, score: float) -> dict:
+    return {"type": kind, "id": ref_id, "title": title, "score": round(float(score), 4)}
+
+
+def _pending() -> list:
+    return _session().info.setdefault("search_pending", [])
+
+
+class SearchIndex:
+    """Extension de Flask que elige el backend y expone la busqueda."""
+
+    def init_app(self, app: Flask) -> None:
+        backend = app.config.get("SEARCH_BACKEND", "auto")
+        if backend == "auto":
+            dialect = app.config["SQLALCHEMY_DATABASE_URI"].split(":", 1)[0].split("+", 1)[0]
+            backend = {"sqlite": "sqlite", "postgresql": "postgres", "postgres": "postgres"}.get(
+                dialect, "memory"
+            )
+        backends = {"sqlite": SQLiteFTSBackend, "postgres": PostgresBackend, "memory": MemoryBackend}
+        if backend not in backends:
+            raise ValueError(f"SEARCH_BACKEND desconocido: {backend}")
+        app.extensions["search"] = backends[backend]()
+
+    @property
+    def backend(self):
+        return current_app.extensions["search"]
+
+    def search(self, query: str, limit: int, offset: int = 0) -> list[dict]:
+        """Devuelve resultados ordenados por relevancia (todas las palabras, la ultima como prefijo)."""
+        return self.backend.search(query, limit, offset)
+
+    def rebuild(self) -> None:
+        """Reconstruye el indice completo (por ejemplo tras una carga masiva con Core)."""
+        self.backend.rebuild()
+
+
+def _on_upsert(mapper, connection, target) -> None:
+    kind, fields = _documents(target)
+    current_app.extensions["search"].upsert(connection, kind, target.id, fields)
+
+
+def _on_update(mapper, connection, target) -> None:
+    # after_update se dispara por cualquier columna (p. ej. total_episodes en add_season).
+    attrs = inspect(target).attrs
+    if any(
+        attrs[name].history.has_changes() for name in INDEXED_ATTRIBUTES if name in mapper.attrs
+    ):
+        _on_upsert(mapper, connection, target)
+
+
+def _on_delete(mapper, connection, target) -> None:
+    kind, _ = _documents(target)
+    current_app.extensions["search"].delete(connection, kind, target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session) -> None:
+    for backend, kind, ref_id, fields in session.info.pop("search_pending", []):
+        backend.apply(kind, ref_id, fields)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session, previous_transaction) -> None:
+    session.info.pop("search_pending", None)
+
+
+def register_model_events() -> None:
+    """Mantiene el indice sincronizado con los cambios ORM de Movie y Series."""
+    from src.models import Movie, Series
+
+    for model in (Movie, Series):
+        if not event.contains(model, "after_insert", _on_upsert):
+            event.listen(model, "after_insert", _on_upsert)
+            event.listen(model, "after_update", _on_update)
+            event.listen(model, "after_delete", _on_delete)
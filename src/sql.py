@@ -0,0 +1,155 @@
+"""Helpers SQL que dependen del dialecto de la base configurada."""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+import weakref
+
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.extensions import db
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: solo se serializa dentro del proceso
+    fcntl = None
+
+_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def dialect_insert(table):
+    """Devuelve un INSERT con soporte de `ON CONFLICT` para el dialecto activo."""
+    dialect = db.session.get_bind().dialect.name
+    try:
+        return _INSERTS[dialect](table)
+    except KeyError:
+        raise NotImplementedError(f"ON CONFLICT no soportado para el dialecto '{dialect}'") from None
+
+
+class SQLiteWriteLock:
+    """Serializa las escrituras de todos los procesos que comparten un archivo SQLite.
+
+    Un candado de hilo ordena las escrituras del worker y `flock` sobre
+    `<base>.lock` las de los demas workers. Las lecturas no lo toman; con WAL
+    siguen siendo concurrentes mientras otro escribe.
+    """
+
+    def __init__(self, database: str, timeout: float) -> None:
+        self.path = f"{database}.lock"
+        self.timeout = timeout
+        self._thread_lock = threading.Lock()
+        self._fd: int | None = None
+
+    def acquire(self) -> None:
+        deadline = time.monotonic() + self.timeout
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            raise TimeoutError("Tiempo de espera agotado para escribir en SQLite")
+        if fcntl is None:
+            return
+        try:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            while True:
+                try:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError("Tiempo de espera agotado para escribir en SQLite") from None
+                    time.sleep(0.001)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+    def release(self) -> None:
+        if fcntl is not None and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    def reset_after_fork(self) -> None:
+        # El descriptor heredado comparte el flock con el padre: cada worker abre el suyo.
+        self._thread_lock = threading.Lock()
+        self._fd = None
+
+
+_WRITE_RE = re.compile(r"^\s*(INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER)\b", re.IGNORECASE)
+_WRITE_LOCKS: "weakref.WeakSet[SQLiteWriteLock]" = weakref.WeakSet()
+_CONFIGURED_ENGINES: weakref.WeakSet = weakref.WeakSet()
+
+
+def init_sqlite(app: Flask) -> None:
+    """Aplica los PRAGMA de `SQLITE_*` en cada conexion y, si se pide, serializa las escrituras.
+
+    `foreign_keys` siempre se activa: SQLite no valida las claves foraneas por defecto.
+    """
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != "sqlite" or engine in _CONFIGURED_ENGINES:
+        return
+    _CONFIGURED_ENGINES.add(engine)
+
+    database = engine.url.database
+    in_memory = not database or database == ":memory:" or "mode=memory" in str(engine.url)
+    pragmas = [
+        "PRAGMA foreign_keys=ON",
+        f"PRAGMA busy_timeout={int(app.config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        f"PRAGMA cache_size={int(app.config['SQLITE_CACHE_SIZE'])}",
+    ]
+    if not in_memory:
+        pragmas += [
+            f"PRAGMA journal_mode={app.config['SQLITE_JOURNAL_MODE']}",
+            f"PRAGMA synchronous={app.config['SQLITE_SYNCHRONOUS']}",
+            f"PRAGMA mmap_size={int(app.config['SQLITE_MMAP_SIZE'])}",
+        ]
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    if in_memory or not app.config["SQLITE_SERIALIZE_WRITES"]:
+        return
+
+    lock = SQLiteWriteLock(database, app.config["SQLITE_WRITE_LOCK_TIMEOUT_MS"] / 1000)
+    _WRITE_LOCKS.add(lock)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _lock_before_write(conn, cursor, statement, parameters, context, executemany) -> None:
+        # pysqlite abre la transaccion (BEGIN) recien con la primera escritura, asi que
+        # tomar el candado aca evita que dos transacciones de escritura se crucen.
+        if "sqlite_write_lock" not in conn.info and _WRITE_RE.match(statement):
+            lock.acquire()
+            conn.info["sqlite_write_lock"] = True
+
+    def _unlock(info: dict) -> None:
+        if info.pop("sqlite_write_lock", None):
+            lock.release()
+
+    # Se libera al devolver la conexion al pool, ya con el COMMIT/ROLLBACK hecho
+    # (Session y engine.begin() la devuelven al terminar cada transaccion).
+    @event.listens_for(engine.pool, "checkin")
+    def _unlock_on_checkin(dbapi_connection, connection_record) -> None:
+        _unlock(connection_record.info)
+
+    @event.listens_for(engine.pool, "invalidate")
+    def _unlock_on_invalidate(dbapi_connection, connection_record, exception) -> None:
+        _unlock(connection_record.info)
+
+
+def _reset_write_locks_after_fork() -> None:
+    for lock in list(_WRITE_LOCKS):
+        lock.reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_write_locks_after_fork)
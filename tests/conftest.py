@@ -0,0 +1,51 @@
+"""Fixtures compartidas: app en memoria, cliente HTTP y contador de sentencias SQL."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from src import create_app
+from src.config import TestingConfig
+from src.extensions import db
+
+
+@pytest.fixture
+def app():
+    """App con SQLite en memoria y el esquema creado con `create_all`."""
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def count_queries(app):
+    """Context manager que devuelve la lista de sentencias ejecutadas dentro del bloque."""
+    with app.app_context():
+        engine = db.engine
+
+    @contextmanager
+    def counter():
+        statements: list[str] = []
+
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+    return counter
@@ -0,0 +1,35 @@
+"""Lecturas por lote de peliculas y series con seleccion de campos."""
+
+from __future__ import annotations
+
+from src.extensions import db
+from src.models import Movie, Series
+
+
+def _seed(app) -> None:
+    with app.app_context():
+        db.session.add_all([Movie(title=f"m{i}") for i in range(1, 4)])
+        db.session.add_all([Series(title=f"s{i}", image_url=f"u{i}") for i in range(1, 4)])
+        db.session.commit()
+
+
+def test_movies_ignore_series_only_fields(app, client):
+    _seed(app)
+
+    body = client.get("/movies/?ids=3,1,9&fields=id,title,image_url").get_json()
+
+    assert body == {"items": [{"id": 3, "title": "m3"}, {"id": 1, "title": "m1"}], "missing": [9]}
+
+
+def test_series_batch_with_same_fields(app, client):
+    _seed(app)
+
+    body = client.post("/series/batch", json={"ids": [2], "fields": ["id", "title", "image_url"]}).get_json()
+
+    assert body["items"] == [{"id": 2, "title": "s2", "image_url": "u2"}]
+
+
+def test_unknown_field_is_rejected(app, client):
+    _seed(app)
+
+    assert client.get("/movies/?ids=1&fields=poster").status_code == 400
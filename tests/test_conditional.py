@@ -0,0 +1,32 @@
+"""GET condicional de los listados: solo ETag, para que un borrado invalide la pagina."""
+
+from __future__ import annotations
+
+from src.extensions import db
+from src.models import Movie
+
+
+def test_list_ignores_if_modified_since_after_delete(app, client):
+    with app.app_context():
+        db.session.add_all([Movie(title=f"m{i}") for i in range(1, 4)])
+        db.session.commit()
+    first = client.get("/movies/")
+    assert "Last-Modified" not in first.headers
+
+    client.delete("/movies/2")
+    stale = client.get("/movies/", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    cached = client.get("/movies/", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert stale.status_code == cached.status_code == 200
+    assert [item["id"] for item in cached.get_json()["items"]] == [1, 3]
+
+
+def test_detail_keeps_last_modified(app, client):
+    with app.app_context():
+        db.session.add(Movie(title="m1"))
+        db.session.commit()
+    first = client.get("/movies/1")
+
+    again = client.get("/movies/1", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+
+    assert again.status_code == 304
@@ -0,0 +1,54 @@
+"""El orden de "seguir viendo" depende de la actividad del usuario, no de cambios del catalogo."""
+
+from __future__ import annotations
+
+from src.extensions import cache, continue_watching_store, db
+from src.models import Series, User
+
+HEADERS = {"X-User-Id": "1"}
+
+
+def _seed(app) -> None:
+    with app.app_context():
+        db.session.add(User(id=1, name="ana"))
+        db.session.add_all([Series(title="A"), Series(title="B")])
+        db.session.commit()
+
+
+def _feed(client) -> list[str]:
+    return [item["title"] for item in client.get("/me/continue-watching", headers=HEADERS).get_json()["items"]]
+
+
+def test_new_season_does_not_reorder_feed(app, client):
+    _seed(app)
+    client.post("/watchlist/series/1", headers=HEADERS)
+    client.post("/watchlist/series/2", headers=HEADERS)
+
+    # Refresca total_episodes (y updated_at) de la entrada de A sin actividad del usuario.
+    client.post("/series/1/seasons", json={"number": 1, "episodes_count": 8})
+
+    assert _feed(client) == ["B", "A"]
+
+
+def test_progress_moves_entry_to_front(app, client):
+    _seed(app)
+    client.post("/watchlist/series/1", headers=HEADERS)
+    client.post("/watchlist/series/2", headers=HEADERS)
+    assert _feed(client) == ["B", "A"]
+
+    client.patch("/progress/series/1", json={"current_season": 1, "current_episode": 1}, headers=HEADERS)
+
+    assert _feed(client) == ["A", "B"]
+
+
+def test_feed_uses_its_own_store(app, client):
+    _seed(app)
+    client.post("/watchlist/series/1", headers=HEADERS)
+
+    _feed(client)
+    _feed(client)
+
+    with app.app_context():
+        catalog, feeds = cache.stats(), continue_watching_store.stats()
+    assert (catalog["hits"], catalog["misses"], catalog["size"]) == (0, 0, 0)
+    assert (feeds["hits"], feeds["misses"], feeds["size"]) == (1, 1, 1)
@@ -0,0 +1,36 @@
+"""Readiness: las peticiones no esperan a un probe colgado."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from src.api import health
+
+
+def test_ready_serves_last_result_while_probe_hangs(app, client, monkeypatch):
+    app.config["HEALTH_CACHE_SECONDS"] = 0
+    assert client.get("/health/ready").status_code == 200
+
+    started, release = threading.Event(), threading.Event()
+
+    def hanging_probe(*args):
+        started.set()
+        release.wait(5)
+        return {"status": "unavailable", "checks": {}}
+
+    monkeypatch.setattr(health.service, "_probe", hanging_probe)
+    worker = threading.Thread(target=lambda: app.test_client().get("/health/ready"))
+    worker.start()
+    assert started.wait(5)
+    try:
+        begin = time.perf_counter()
+        response = client.get("/health/ready")
+        elapsed = time.perf_counter() - begin
+    finally:
+        release.set()
+        worker.join()
+
+    assert response.status_code == 200
+    assert response.get_json()["status"] == "ready"
+    assert elapsed < 1
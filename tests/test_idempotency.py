@@ -0,0 +1,34 @@
+"""Las respuestas de Idempotency-Key no usan el cache del catalogo."""
+
+from __future__ import annotations
+
+from src.extensions import cache, db
+from src.models import Movie, User
+
+HEADERS = {"X-User-Id": "1", "Idempotency-Key": "alta-1"}
+
+
+def test_replay_does_not_touch_catalog_cache(app, client):
+    with app.app_context():
+        db.session.add_all([User(id=1, name="ana"), Movie(title="M")])
+        db.session.commit()
+
+    first = client.post("/watchlist/movies/1", headers=HEADERS)
+    replay = client.post("/watchlist/movies/1", headers=HEADERS)
+
+    assert first.status_code == replay.status_code == 201
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.get_data() == first.get_data()
+    with app.app_context():
+        stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (0, 0, 0)
+
+
+def test_key_reused_with_other_request_is_rejected(app, client):
+    with app.app_context():
+        db.session.add_all([User(id=1, name="ana"), Movie(title="M"), Movie(title="N")])
+        db.session.commit()
+
+    client.post("/watchlist/movies/1", headers=HEADERS)
+
+    assert client.post("/watchlist/movies/2", headers=HEADERS).status_code == 422
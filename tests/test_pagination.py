@@ -0,0 +1,71 @@
+"""Paginacion keyset ordenada: orden correcto con NULL y busqueda por indice."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+
+from src.api.movies import service
+from src.extensions import db
+from src.models import Movie
+
+
+def _seed(app) -> None:
+    with app.app_context():
+        db.session.add_all(
+            [
+                Movie(title=f"m{i % 7}", genre="drama", release_year=None if i % 5 == 0 else 1990 + i % 4)
+                for i in range(1, 41)
+            ]
+        )
+        db.session.commit()
+
+
+def _walk(client, sort: str) -> list[int]:
+    ids, after = [], None
+    while True:
+        url = f"/movies/?limit=3&sort={sort}" + (f"&after={after}" if after else "")
+        body = client.get(url).get_json()
+        ids += [item["id"] for item in body["items"]]
+        after = body["next_cursor"]
+        if not after:
+            return ids
+
+
+@pytest.mark.parametrize("sort", ["title", "-title", "release_year", "-release_year"])
+def test_sorted_pages_cover_all_rows_in_order(app, client, sort):
+    _seed(app)
+    name = sort.lstrip("-")
+    descending = sort.startswith("-")
+    with app.app_context():
+        movies = [(m.id, getattr(m, name)) for m in Movie.query.all()]
+    valued = sorted((m for m in movies if m[1] is not None), key=lambda m: (m[1], m[0]), reverse=descending)
+    nulls = sorted((m for m in movies if m[1] is None), reverse=descending)
+
+    assert _walk(client, sort) == [m[0] for m in valued + nulls]
+
+
+@pytest.mark.parametrize("genre", [None, "Drama"])
+@pytest.mark.parametrize("sort", ["title", "-release_year", "updated_at"])
+def test_cursor_pages_seek_on_the_index(app, client, sort, genre):
+    _seed(app)
+    after = client.get(f"/movies/?limit=3&sort={sort}").get_json()["next_cursor"]
+
+    with app.app_context():
+        stmt, _, _ = service._page_query(Movie.public_columns(), 3, after, {"genre": genre}, sort)
+        compiled = stmt.compile(db.engine, compile_kwargs={"literal_binds": True})
+        plan = [row[3] for row in db.session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+
+    # Cada lectura de movies es un rango del indice ya ordenado: ni SCAN ni sort de la tabla.
+    for step, following in zip(plan, plan[1:] + [""]):
+        if " movies " in f"{step} ":
+            assert step.startswith("SEARCH") and not following.startswith("USE TEMP B-TREE"), plan
+
+
+def test_series_genre_filter_matches_any_listed_genre(app, client):
+    for title, genres in [("s1", "Drama"), ("s2", "Crimen"), ("s3", "Comedia")]:
+        client.post("/series/", json={"title": title, "genres": genres})
+
+    body = client.get("/series/?genre=drama,crimen").get_json()
+
+    assert [item["title"] for item in body["items"]] == ["s1", "s2"]
@@ -0,0 +1,48 @@
+"""Avance atomico de series: /next y PATCH con un unico UPDATE."""
+
+from __future__ import annotations
+
+from src.extensions import db
+from src.models import Movie, Series, User
+
+HEADERS = {"X-User-Id": "1"}
+
+
+def _seed(app, client) -> None:
+    with app.app_context():
+        db.session.add(User(id=1, name="ana"))
+        db.session.add_all([Movie(title="M1"), Movie(title="M2"), Series(title="S1"), Series(title="S2")])
+        db.session.commit()
+    # S1: temporada 1 de 2 episodios y temporada 2 de 3 (5 en total).
+    client.post("/series/1/seasons", json={"number": 1, "episodes_count": 2})
+    client.post("/series/1/seasons", json={"number": 2, "episodes_count": 3})
+
+
+def _next(client) -> dict:
+    response = client.post("/progress/series/1/next", headers=HEADERS)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_next_moves_to_following_season_and_stops_when_completed(app, client):
+    _seed(app, client)
+    client.post("/watchlist/series/1", headers=HEADERS)
+
+    positions = [_next(client) for _ in range(5)]
+
+    assert [(p["current_season"], p["current_episode"]) for p in positions] == [
+        (1, 1), (1, 2), (2, 1), (2, 2), (2, 3)
+    ]
+    assert [p["status"] for p in positions][-2:] == ["in_progress", "completed"]
+    after_end = _next(client)
+    assert (after_end["watched_episodes"], after_end["current_season"], after_end["current_episode"]) == (5, 2, 3)
+    assert after_end["status"] == "completed"
+
+
+def test_patch_clamps_watched_episodes_to_total(app, client):
+    _seed(app, client)
+    client.post("/watchlist/series/1", headers=HEADERS)
+
+    entry = client.patch("/progress/series/1", json={"watched_episodes": 99}, headers=HEADERS).get_json()
+
+    assert (entry["watched_episodes"], entry["total_episodes"], entry["status"]) == (5, 5, "completed")
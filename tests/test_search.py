@@ -0,0 +1,44 @@
+"""El indice de busqueda en memoria ve cambios hechos fuera de este proceso."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import delete, insert
+
+from src import create_app
+from src.config import TestingConfig
+from src.extensions import db
+from src.models import Movie
+
+
+class MemorySearchConfig(TestingConfig):
+    SEARCH_BACKEND = "memory"
+    SEARCH_MEMORY_CHECK_SECONDS = 0
+
+
+@pytest.fixture
+def app():
+    app = create_app(MemorySearchConfig)
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def _titles(client, query: str) -> list[str]:
+    return [item["title"] for item in client.get(f"/search/?q={query}").get_json()["items"]]
+
+
+def test_memory_index_picks_up_core_writes(app, client):
+    client.post("/movies/", json={"title": "Matrix"})
+    assert _titles(client, "matr") == ["Matrix"]
+
+    # Escrituras sin eventos ORM, como las de otro worker o una carga masiva.
+    with app.app_context():
+        db.session.execute(insert(Movie.__table__), [{"title": "Matrix Reloaded"}])
+        db.session.execute(delete(Movie.__table__).where(Movie.__table__.c.id == 1))
+        db.session.commit()
+
+    assert _titles(client, "matr") == ["Matrix Reloaded"]
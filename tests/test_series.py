@@ -0,0 +1,56 @@
+"""Las lecturas de series cargan las temporadas por lote: las consultas no crecen con los datos."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.extensions import db
+from src.models import Season, Series
+
+
+def _seed_series(app, count: int, seasons: int = 3) -> None:
+    with app.app_context():
+        for i in range(1, count + 1):
+            series = Series(title=f"serie {i}", genres="drama")
+            series.seasons = [Season(number=n, episodes_count=10) for n in range(1, seasons + 1)]
+            db.session.add(series)
+        db.session.commit()
+
+
+def _statements(client, count_queries, url: str) -> int:
+    with count_queries() as statements:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(statements)
+
+
+@pytest.mark.parametrize("count", [1, 25])
+def test_list_series_returns_all_seasons(app, client, count):
+    _seed_series(app, count)
+
+    items = client.get("/series/?limit=50").get_json()["items"]
+
+    assert len(items) == count
+    assert all(len(item["seasons"]) == 3 for item in items)
+
+
+def test_list_series_statement_count_does_not_grow(app, client, count_queries):
+    _seed_series(app, 1)
+    single = _statements(client, count_queries, "/series/?limit=50")
+
+    _seed_series(app, 30)
+    many = _statements(client, count_queries, "/series/?limit=50")
+
+    assert many == single
+
+
+def test_series_detail_statement_count_does_not_grow(app, client, count_queries):
+    _seed_series(app, 1, seasons=1)
+    _seed_series(app, 1, seasons=20)
+
+    # Primera lectura de cada serie: no hay nada en el cache.
+    one_season = _statements(client, count_queries, "/series/1")
+    many_seasons = _statements(client, count_queries, "/series/2")
+
+    assert client.get("/series/2").get_json()["seasons"][-1]["number"] == 20
+    assert many_seasons == one_season
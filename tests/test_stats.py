@@ -0,0 +1,59 @@
+"""El resumen materializado de /me/stats coincide con el GROUP BY en vivo."""
+
+from __future__ import annotations
+
+from src.extensions import db
+from src.models import Movie, Series, User
+
+HEADERS = {"X-User-Id": "1"}
+
+
+def _seed(app, client) -> None:
+    with app.app_context():
+        db.session.add(User(id=1, name="ana"))
+        db.session.add_all([Movie(title="M1"), Movie(title="M2"), Series(title="S1"), Series(title="S2")])
+        db.session.commit()
+    # S1: temporada 1 de 2 episodios y temporada 2 de 3 (5 en total).
+    client.post("/series/1/seasons", json={"number": 1, "episodes_count": 2})
+    client.post("/series/1/seasons", json={"number": 2, "episodes_count": 3})
+
+
+def _next(client) -> dict:
+    response = client.post("/progress/series/1/next", headers=HEADERS)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def _stats(app, client, materialized: bool) -> dict:
+    app.config["WATCHLIST_STATS_MATERIALIZED"] = materialized
+    return client.get("/me/stats", headers=HEADERS).get_json()
+
+
+def _assert_stats_match(app, client) -> dict:
+    materialized = _stats(app, client, True)
+    assert materialized == _stats(app, client, False)
+    return materialized
+
+
+def test_materialized_stats_match_live_query(app, client):
+    _seed(app, client)
+
+    client.post("/watchlist/movies/1", headers=HEADERS)
+    _assert_stats_match(app, client)
+
+    client.post("/watchlist/bulk", json={"movies": [2], "series": [1, 2]}, headers=HEADERS)
+    _assert_stats_match(app, client)
+
+    _next(client)
+    _assert_stats_match(app, client)
+
+    client.patch("/progress/series/1", json={"watched_episodes": 99}, headers=HEADERS)
+    _assert_stats_match(app, client)
+
+    client.post("/series/2/seasons", json={"number": 1, "episodes_count": 4})
+    stats = _assert_stats_match(app, client)
+
+    assert stats["entries"] == 4
+    assert stats["by_status"]["completed"] == 1
+    # Peliculas 1 + 1, S1 5 (completa) y S2 4 (la temporada nueva se suma a la entrada).
+    assert (stats["watched_episodes"], stats["total_episodes"]) == (5, 11)
@@ -0,0 +1,56 @@
+"""La watchlist expandida trae los titulos en la misma consulta que las entradas."""
+
+from __future__ import annotations
+
+from src.extensions import db
+from src.models import Movie, Series, User, WatchEntry
+
+
+def _seed_watchlist(app, user_id: int, entries: int) -> dict:
+    """Alterna peliculas y series en la watchlist del usuario; devuelve sus headers."""
+    with app.app_context():
+        db.session.add(User(id=user_id, name=f"user{user_id}"))
+        for i in range(1, entries + 1):
+            if i % 2:
+                movie = Movie(title=f"pelicula {user_id}-{i}")
+                db.session.add(WatchEntry(user_id=user_id, movie=movie, total_episodes=1))
+            else:
+                series = Series(title=f"serie {user_id}-{i}", image_url=f"https://img/{user_id}-{i}.jpg")
+                db.session.add(WatchEntry(user_id=user_id, series=series, total_episodes=10))
+        db.session.commit()
+    return {"X-User-Id": str(user_id)}
+
+
+def _expanded(client, count_queries, headers: dict) -> tuple[list[dict], int]:
+    with count_queries() as statements:
+        response = client.get("/me/watchlist?expand=title", headers=headers)
+    assert response.status_code == 200
+    return response.get_json(), len(statements)
+
+
+def test_expand_title_embeds_catalog_data(app, client):
+    headers = _seed_watchlist(app, 1, 4)
+
+    items = client.get("/me/watchlist?expand=title", headers=headers).get_json()
+
+    by_title = {item["title"]: item for item in items}
+    assert by_title["pelicula 1-1"]["movie_id"] and by_title["pelicula 1-1"]["image_url"] is None
+    assert by_title["serie 1-2"]["series_id"] and by_title["serie 1-2"]["image_url"] == "https://img/1-2.jpg"
+
+
+def test_expand_title_statement_count_does_not_grow(app, client, count_queries):
+    small_user = _seed_watchlist(app, 1, 2)
+    large_user = _seed_watchlist(app, 2, 50)
+
+    small_items, small = _expanded(client, count_queries, small_user)
+    large_items, large = _expanded(client, count_queries, large_user)
+
+    assert len(small_items) == 2 and len(large_items) == 50
+    assert all(item["title"] for item in large_items)
+    assert large == small
+
+
+def test_unknown_expand_is_rejected(client):
+    response = client.get("/me/watchlist?expand=poster", headers={"X-User-Id": "1"})
+
+    assert response.status_code == 400